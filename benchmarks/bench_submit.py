@@ -0,0 +1,120 @@
+"""Driver-side calls per second: synchronous CWLApp calls vs AsyncSubmitter
+
+Run from the repository root:
+    python benchmarks/bench_submit.py [-n CALLS] [-w WORKERS] [-p MAX_PENDING]
+
+Measures how fast the driver thread can issue calls, i.e. the time until control
+returns to the caller for every call, and separately the time until every call is
+submitted to Parsl and completed. "plan only" is the argument processing and
+rendering of CWLApp alone. The commands themselves (`touch`) are trivial.
+
+The unbounded async run only measures putting calls on a queue. With a bounded
+queue (max_pending < calls) the driver is held back to the submission rate once
+the queue is full, which is the steady state of a long campaign.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+import parsl
+from parsl.config import Config
+from parsl.executors.threads import ThreadPoolExecutor
+
+from cwl import AsyncSubmitter, CWLApp
+
+
+def calls(outdir: str, n: int):
+    """kwargs of n touch calls"""
+    for i in range(n):
+        filename = os.path.join(outdir, f"touch_{i}.txt")
+        yield {"filenames": [filename]}
+
+
+def bench_plan(touch: CWLApp, outdir: str, n: int):
+    """Time of the argument processing and rendering alone, nothing submitted"""
+    start = time.perf_counter()
+    for kwargs in calls(outdir, n):
+        touch.plan(**kwargs)
+
+    elapsed = time.perf_counter() - start
+    return elapsed, float("nan"), float("nan")
+
+
+def bench_sync(touch: CWLApp, outdir: str, n: int):
+    """Driver time of n synchronous calls, and time until all are done"""
+    start = time.perf_counter()
+    futures = [touch(**kwargs) for kwargs in calls(outdir, n)]
+    issued = time.perf_counter() - start
+
+    for future in futures:
+        future.result()
+
+    return issued, issued, time.perf_counter() - start
+
+
+def bench_async(touch: CWLApp, outdir: str, n: int, workers: int, max_pending: int):
+    """Driver time of n async calls, time until all are submitted and until all are done"""
+    start = time.perf_counter()
+    with AsyncSubmitter(workers=workers, max_pending=max_pending) as submitter:
+        futures = [submitter.submit(touch, **kwargs) for kwargs in calls(outdir, n)]
+        issued = time.perf_counter() - start
+
+    submitted = time.perf_counter() - start
+
+    for future in futures:
+        future.result()
+
+    return issued, submitted, time.perf_counter() - start
+
+
+def main() -> None:
+    """Run both benchmarks and print calls per second"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--calls", type=int, default=2000)
+    parser.add_argument("-w", "--workers", type=int, default=2, help="submitter threads")
+    parser.add_argument(
+        "-p", "--max-pending", type=int, default=100, help="queue bound of the bounded async run"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as outdir:
+        parsl.load(
+            Config(
+                executors=[ThreadPoolExecutor(label="threads", max_threads=8)],
+                run_dir=os.path.join(outdir, "runinfo"),
+            )
+        )
+        touch = CWLApp(os.path.join("tests", "test-cwl-files", "touch.cwl"))
+
+        try:
+            results = {
+                "plan only": bench_plan(touch, outdir, args.calls),
+                "sync": bench_sync(touch, outdir, args.calls),
+                "async, unbounded": bench_async(
+                    touch, outdir, args.calls, args.workers, args.calls
+                ),
+                f"async, max_pending={args.max_pending}": bench_async(
+                    touch, outdir, args.calls, args.workers, args.max_pending
+                ),
+            }
+
+        finally:
+            parsl.dfk().cleanup()
+
+    print(f"{args.calls} calls, {args.workers} submitter threads")
+    print(f"{'mode':<28}{'driver calls/s':>16}{'submitted/s':>14}{'completed/s':>14}")
+    for mode, (issued, submitted, done) in results.items():
+        print(
+            f"{mode:<28}{args.calls / issued:>16.0f}"
+            f"{args.calls / submitted:>14.0f}{args.calls / done:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
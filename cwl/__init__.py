@@ -1 +1,6 @@
-from cwl.cwl_app import CWLApp
\ No newline at end of file
+from cwl.cwl_app import CWLApp
+from cwl.output_store import OutputHandle, OutputStore
+from cwl.planner import PlanError, PlanReport, plan_calls
+from cwl.router import ExecutorRouter
+from cwl.graph import CWLGraph
+from cwl.submitter import AsyncSubmitter, PendingCall
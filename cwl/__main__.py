@@ -0,0 +1,279 @@
+"""Command line runner for CWL CommandLineTools
+
+Usage:
+    python -m cwl run tool.cwl job.yml [job2.yml ...] [--executor local|threads|htex] [-j N]
+    python -m cwl validate tool.cwl [job.yml ...]
+
+Parsl is only imported once jobs are submitted through it, so `--help` and
+`validate` return immediately.
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+EXECUTORS = ("local", "threads", "htex")
+
+
+def load_job(job_file: str) -> Dict[str, Any]:
+    """Read a cwltool-style job file
+
+    Args:
+        job_file (str): YAML/JSON file mapping input and output ids to values
+
+    Returns:
+        Dict[str, Any]: job values, with `class: File` entries left as dicts
+    """
+    import yaml
+
+    with open(job_file, "r", encoding="utf-8") as f:
+        job = yaml.safe_load(f) or {}
+
+    if not isinstance(job, dict):
+        raise ValueError(f"{job_file}: job file must be a mapping of argument ids to values")
+
+    return job
+
+
+def _to_parsl_files(value: Any, base_dir: str) -> Any:
+    """Replace `{class: File, path: ...}` entries with Parsl File objects
+
+    Relative paths are resolved against the directory of the job file, as cwltool does.
+    """
+    from parsl.data_provider.files import File
+
+    if isinstance(value, list):
+        return [_to_parsl_files(v, base_dir) for v in value]
+
+    if isinstance(value, dict) and value.get("class") == "File":
+        path = value.get("path", value.get("location"))
+        if path is None:
+            raise ValueError(f"File entry without 'path' or 'location': {value}")
+
+        if path.startswith("file://"):
+            path = path[len("file://") :]
+
+        return File(os.path.join(base_dir, path))
+
+    return value
+
+
+def job_names(job_files: List[str]) -> List[str]:
+    """Unique name of each job, for the stdout/stderr files written for it
+
+    A job is named by its file's path, without extension, relative to the directory
+    all job files share: `a/job.yml` and `b/job.yml` are `a/job` and `b/job`. A job
+    file given more than once gets its position as a suffix: `job.0`, `job.2`.
+    """
+    paths = [os.path.splitext(os.path.abspath(job_file))[0] for job_file in job_files]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ""
+    names = [os.path.relpath(path, root) for path in paths]
+
+    return [
+        f"{name}.{index}" if names.count(name) > 1 else name for index, name in enumerate(names)
+    ]
+
+
+def job_kwargs(app, job_file: str, outdir: str, job_name: Optional[str] = None) -> Dict[str, Any]:
+    """Keyword arguments for a CWLApp call from a job file
+
+    stdout/stderr outputs missing from the job, and not named by the tool, are written
+    to `<outdir>/<job name>.<output id>`. The job name defaults to the file name.
+    """
+    job = load_job(job_file)
+    base_dir = os.path.dirname(os.path.abspath(job_file))
+    kwargs = {key: _to_parsl_files(value, base_dir) for key, value in job.items()}
+
+    if job_name is None:
+        job_name = os.path.splitext(os.path.basename(job_file))[0]
+
+    missing = app.missing_arguments(kwargs)
+    for output_arg in app.outputs:
+        if output_arg.arg_type in ("stdout", "stderr") and output_arg.arg_id in missing:
+            kwargs[output_arg.arg_id] = os.path.join(outdir, f"{job_name}.{output_arg.arg_id}")
+
+    return kwargs
+
+
+def _parsl_config(executor: str, workers: int, run_dir: Optional[str] = None):
+    """Parsl config for the selected executor
+
+    Parsl logs (and the HighThroughputExecutor's certificates) go to run_dir, a new
+    temporary directory if None, never to `runinfo/` in the current directory.
+    """
+    import tempfile
+
+    from parsl.config import Config
+
+    if run_dir is None:
+        run_dir = tempfile.mkdtemp(prefix="cwl-runinfo-")
+
+    if executor == "threads":
+        from parsl.executors.threads import ThreadPoolExecutor
+
+        return Config(
+            executors=[ThreadPoolExecutor(label="threads", max_threads=workers)], run_dir=run_dir
+        )
+
+    from parsl.executors import HighThroughputExecutor
+    from parsl.providers import LocalProvider
+
+    return Config(
+        executors=[
+            HighThroughputExecutor(
+                label="htex_local",
+                max_workers_per_node=workers,
+                provider=LocalProvider(init_blocks=1, max_blocks=1),
+            )
+        ],
+        run_dir=run_dir,
+    )
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run every job file against the tool in parallel
+
+    Returns:
+        int: 0 if every job succeeded, 1 otherwise
+    """
+    from cwl.cwl_app import CWLApp
+
+    app = CWLApp(args.tool)
+    # keyed by position, a job file may be given more than once
+    results: Dict[int, Optional[str]] = {}
+    pending = {}
+
+    if args.executor == "local":
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=args.workers)
+        submit = lambda kwargs: pool.submit(app.run_local, **kwargs)  # noqa: E731
+        shutdown = pool.shutdown
+
+    else:
+        import parsl
+
+        dfk = parsl.load(_parsl_config(args.executor, args.workers, args.run_dir))
+        submit = lambda kwargs: app(**kwargs)  # noqa: E731
+        shutdown = dfk.cleanup
+
+    try:
+        for index, (job_file, job_name) in enumerate(zip(args.jobs, job_names(args.jobs))):
+            try:
+                pending[index] = submit(job_kwargs(app, job_file, args.outdir, job_name))
+
+            except Exception as e:  # pylint: disable=broad-except
+                results[index] = str(e)
+
+        for index, future in pending.items():
+            try:
+                exit_code = future.result()
+                results[index] = f"exit code {exit_code}" if exit_code else None
+
+            except Exception as e:  # pylint: disable=broad-except
+                results[index] = str(e)
+
+    finally:
+        shutdown()
+
+    for index, job_file in enumerate(args.jobs):
+        error = results[index]
+        print(f"{job_file}: {'ok' if error is None else 'FAILED: ' + error}")
+
+    return 0 if all(error is None for error in results.values()) else 1
+
+
+def validate(args: argparse.Namespace) -> int:
+    """Validate the tool and check each job file provides the required inputs
+
+    Returns:
+        int: 0 if the tool and all job files are valid, 1 otherwise
+    """
+    from cwl.cwl_app import CWLApp, InvalidCWL
+
+    try:
+        app = CWLApp(args.tool)
+
+    except InvalidCWL as e:
+        print(f"{args.tool}: {e}")
+        return 1
+
+    print(f"{args.tool}: ok")
+
+    # stdout/stderr missing from a job are defaulted by `run`
+    streams = {arg.arg_id for arg in app.outputs if arg.arg_type in ("stdout", "stderr")}
+
+    status = 0
+    for job_file in args.jobs:
+        try:
+            missing = app.missing_arguments(load_job(job_file))
+            missing = [arg_id for arg_id in missing if arg_id not in streams]
+
+        except (OSError, ValueError) as e:
+            missing = [str(e)]
+
+        if missing:
+            status = 1
+            print(f"{job_file}: missing required value for argument(s): {', '.join(missing)}")
+
+        else:
+            print(f"{job_file}: ok")
+
+    return status
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for `python -m cwl`"""
+    parser = argparse.ArgumentParser(
+        prog="python -m cwl", description="Run CWL CommandLineTools with Parsl"
+    )
+    subparsers = parser.add_subparsers(dest="subcommand", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run a tool once per job file")
+    run_parser.add_argument("tool", help="CWL CommandLineTool file")
+    run_parser.add_argument("jobs", nargs="+", help="job files with the input/output values")
+    run_parser.add_argument(
+        "-e",
+        "--executor",
+        choices=EXECUTORS,
+        default="local",
+        help="local: subprocesses without Parsl; threads: Parsl ThreadPoolExecutor; "
+        "htex: Parsl HighThroughputExecutor on this machine (default: local)",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of jobs to run at once (default: number of CPUs)",
+    )
+    run_parser.add_argument(
+        "-o",
+        "--outdir",
+        default=".",
+        help="directory for stdout/stderr outputs not named in the job file (default: .)",
+    )
+    run_parser.add_argument(
+        "--run-dir",
+        default=None,
+        help="directory for Parsl logs (default: a new temporary directory)",
+    )
+    run_parser.set_defaults(func=run)
+
+    validate_parser = subparsers.add_parser("validate", help="validate a tool and job files")
+    validate_parser.add_argument("tool", help="CWL CommandLineTool file")
+    validate_parser.add_argument("jobs", nargs="*", help="job files to check against the tool")
+    validate_parser.set_defaults(func=validate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for `python -m cwl`"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Streaming checksums of tool outputs, computed where the outputs were written"""
+
+import hashlib
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+CHUNK_SIZE = 1 << 20
+
+# files above this size are read by a separate thread while the previous chunk is hashed
+PREFETCH_SIZE = 64 << 20
+
+
+def _read_chunks(f, length: Optional[int], chunk_size: int):
+    """Read up to length bytes (everything if None) from f in chunks"""
+    while length is None or length > 0:
+        chunk = f.read(chunk_size if length is None else min(chunk_size, length))
+        if not chunk:
+            return
+
+        if length is not None:
+            length -= len(chunk)
+
+        yield chunk
+
+
+def _prefetch(chunks, depth: int = 4):
+    """Iterate over chunks read ahead by a background thread
+
+    hashlib and file reads both release the GIL, so reading the next chunk overlaps
+    with hashing the current one.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    done = object()
+    errors = []
+
+    def reader():
+        try:
+            for chunk in chunks:
+                buffer.put(chunk)
+
+        except Exception as e:  # pylint: disable=broad-except
+            errors.append(e)
+
+        finally:
+            buffer.put(done)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    while (chunk := buffer.get()) is not done:
+        yield chunk
+
+    thread.join()
+    if errors:
+        raise errors[0]
+
+
+def file_checksum(
+    path: str,
+    algorithm: str = "sha256",
+    offset: int = 0,
+    length: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> str:
+    """Checksum of a file, or of a byte range of it, read in chunks
+
+    Args:
+        path (str): File to hash
+        algorithm (str): Any algorithm supported by hashlib
+        offset (int): Start of the range to hash
+        length (Optional[int]): Length of the range to hash, None for the rest of the file
+        chunk_size (int): Bytes read at a time
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        size = os.fstat(f.fileno()).st_size - offset if length is None else length
+        chunks = _read_chunks(f, length, chunk_size)
+        if size > PREFETCH_SIZE:
+            chunks = _prefetch(chunks)
+
+        for chunk in chunks:
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def file_checksums(
+    paths: List[str], algorithm: str = "sha256", max_workers: Optional[int] = None
+) -> Dict[str, str]:
+    """Checksums of several files, hashed in parallel
+
+    Args:
+        paths (List[str]): Files to hash
+        algorithm (str): Any algorithm supported by hashlib
+        max_workers (Optional[int]): Number of hashing threads, defaults to one per CPU
+
+    Returns:
+        Dict[str, str]: path -> hex digest
+    """
+    paths = list(dict.fromkeys(paths))
+    if len(paths) <= 1:
+        return {path: file_checksum(path, algorithm) for path in paths}
+
+    max_workers = min(len(paths), max_workers or os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        digests = pool.map(lambda path: file_checksum(path, algorithm), paths)
+        return dict(zip(paths, digests))
+
+
+_manifest_lock = threading.Lock()
+
+
+def write_manifest(manifest: str, checksums: Dict[str, str]) -> None:
+    """Append checksums to a manifest in the `sha256sum`/`md5sum` format
+
+    Args:
+        manifest (str): Manifest file
+        checksums (Dict[str, str]): path -> hex digest
+    """
+    lines = "".join(f"{digest}  {path}\n" for path, digest in checksums.items())
+    with _manifest_lock, open(manifest, "a", encoding="utf-8") as f:
+        f.write(lines)
@@ -1,18 +1,26 @@
 """Module to represent a CWL Command Line Tool and run it using Parsl"""
 
+import hashlib
 import os
 import pprint
+import shlex
+import uuid
 from collections import namedtuple
+from functools import partial
 from typing import Any, Dict, List, Optional, Union
 
 import yaml
-from parsl.app.app import bash_app
-from parsl.app.futures import DataFuture
-from parsl.data_provider.files import File
 from schema import And
 from schema import Optional as Opt
 from schema import Or, Regex, Schema, SchemaError
 
+from cwl.checksums import write_manifest
+from cwl.expressions import Expression, InvalidExpression, compile_expression
+from cwl.graph import load_document, tool_document
+from cwl.output_store import OutputHandle, OutputStore
+from cwl.router import ExecutorRouter, Executors
+from cwl.worker import run_command, run_command_to_store, run_command_with_checksums
+
 
 class InputArgument:
     """Class to represent input arguments for a command line tool"""
@@ -27,6 +35,7 @@ class InputArgument:
         "prefix",
         "item_separator",
         "separate",
+        "value_from",
     )
 
     BOOLEAN = "boolean"
@@ -49,6 +58,7 @@ class InputArgument:
         prefix: Optional[str] = None,
         item_separator: Optional[str] = None,
         separate: bool = True,
+        value_from: Optional[Expression] = None,
     ) -> None:
         """Class to represent input arguments for a command line tool
 
@@ -62,6 +72,7 @@ class InputArgument:
             prefix (Optional[str]): Add a prefix to the input argument
             item_separator (Optional[str]): Separator for items in the array
             separate (bool): Add a space between the prefix and the input argument
+            value_from (Optional[Expression]): Compiled valueFrom, rendered instead of the value
         """
 
         self.arg_id = arg_id
@@ -73,6 +84,7 @@ class InputArgument:
         self.prefix = prefix
         self.item_separator = item_separator
         self.separate = separate
+        self.value_from = value_from
 
     def __repr__(self) -> str:
         return str({slot: getattr(self, slot) for slot in self.__slots__})
@@ -102,19 +114,28 @@ class InputArgument:
 
         return input_arg_str
 
-    def to_string(self, value: Any = None) -> str:
+    def to_string(self, value: Any = None, inputs: Optional[Dict[str, Any]] = None) -> str:
         """String representation of the input argument
 
         Args:
             value (Any, optional): input arg value. Defaults to None.
+            inputs (Optional[Dict[str, Any]]): values of all inputs, for valueFrom
         """
-        if self.arg_type == self.BOOLEAN:
+        if self.arg_type == self.BOOLEAN and self.value_from is None:
             return self.__boolean_to_string(value)
 
         if value is None:
             value = self.default
 
-        res_string = self.__process_value(value)
+        if self.value_from is not None:
+            value = self.value_from.evaluate(inputs or {}, value)
+            # a valueFrom that evaluates to null leaves the argument out, as in CWL
+            if value is None:
+                return ""
+
+            res_string = self.__process_value_from(value)
+        else:
+            res_string = self.__process_value(value)
 
         if self.prefix:
             res_string = (
@@ -134,6 +155,13 @@ class InputArgument:
 
         return str(value) if self.arg_type != self.FILE else str(value.filepath)
 
+    def __process_value_from(self, value: Any) -> str:
+        if isinstance(value, list):
+            itm_sep = self.item_separator if self.item_separator else " "
+            return itm_sep.join(str(getattr(v, "filepath", v)) for v in value)
+
+        return str(getattr(value, "filepath", value))
+
     def __process_array_value(self, value: Any) -> str:
         itm_sep = self.item_separator if self.item_separator else " "
         str_value_list = [str(v) if self.arg_type != self.FILE else str(v.filepath) for v in value]
@@ -153,7 +181,79 @@ class InputArgument:
         return self.position < other.position
 
 
-OutputArgument = namedtuple("Output", ["arg_id", "arg_type", "array"])
+class CommandArgument:
+    """Class to represent an entry of `arguments` for a command line tool"""
+
+    __slots__ = ("value_from", "position", "prefix", "separate", "rendered")
+
+    def __init__(
+        self,
+        value_from: Expression,
+        position: int = 0,
+        prefix: Optional[str] = None,
+        separate: bool = True,
+    ) -> None:
+        """Class to represent an entry of `arguments` for a command line tool
+
+        Args:
+            value_from (Expression): Compiled value of the argument
+            position (int): Position of the argument, 0 if not given (as in CWL)
+            prefix (Optional[str]): Add a prefix to the argument
+            separate (bool): Add a space between the prefix and the argument
+        """
+        self.value_from = value_from
+        self.position = position
+        self.prefix = prefix
+        self.separate = separate
+
+        # arguments without parameter references are rendered once, here
+        self.rendered = self.__render(value_from.evaluate({})) if value_from.is_constant else None
+
+    def __repr__(self) -> str:
+        return str({slot: getattr(self, slot) for slot in self.__slots__})
+
+    def __str__(self) -> str:
+        return str({slot: getattr(self, slot) for slot in self.__slots__})
+
+    def to_string_template(self) -> str:
+        """Template string representation of the argument"""
+        if self.prefix:
+            sep = " " if self.separate else ""
+            return f"{self.prefix}{sep}{self.value_from.source}"
+
+        return self.value_from.source
+
+    def to_string(self, inputs: Dict[str, Any]) -> str:
+        """String representation of the argument
+
+        Args:
+            inputs (Dict[str, Any]): values of all inputs of the call
+        """
+        if self.rendered is not None:
+            return self.rendered
+
+        return self.__render(self.value_from.evaluate(inputs))
+
+    def __render(self, value: Any) -> str:
+        if value is None:
+            return ""
+
+        if isinstance(value, list):
+            res_string = " ".join(str(getattr(v, "filepath", v)) for v in value)
+        else:
+            res_string = str(getattr(value, "filepath", value))
+
+        if self.prefix:
+            res_string = (
+                f"{self.prefix} " + res_string if self.separate else f"{self.prefix}{res_string}"
+            )
+
+        return res_string
+
+
+OutputArgument = namedtuple(
+    "OutputArgument", ["arg_id", "arg_type", "array", "glob"], defaults=(None,)
+)
 
 
 class InvalidCWL(Exception):
@@ -183,24 +283,84 @@ class ArgumentMissing(Exception):
 class CWLApp:
     """Class to represent a CWL Command Line Tool and run it using Parsl"""
 
-    def __init__(self, cwl_file: str) -> None:
+    # keyword argument of a call that overrides the executor it is routed to
+    EXECUTOR_KWARG = "parsl_executor"
+
+    EXECUTOR_HINT = "ParslExecutor"
+
+    # checksums of outputs kept in an OutputStore are listed by stored name, not by path,
+    # next to the manifest so that `sha256sum -c <manifest>` still works
+    STORED_MANIFEST_SUFFIX = ".stored"
+
+    def __init__(
+        self,
+        cwl_file: str,
+        output_store: Optional[OutputStore] = None,
+        checksum: Optional[str] = None,
+        manifest: Optional[str] = None,
+        router: Optional[ExecutorRouter] = None,
+    ) -> None:
         """Command Line Tool
 
         Args:
-            cwl_file (str): CWL specs file for the Command Line Tool
+            cwl_file (str): CWL specs file for the Command Line Tool, or
+                `packed.cwl#tool_id` for a tool of a packed `$graph` document
+            output_store (Optional[OutputStore]): Keep stdout/stderr of every call in this
+                store instead of writing one file per output. The future of a call then
+                returns a dict of output id -> OutputHandle.
+            checksum (Optional[str]): hashlib algorithm (e.g. "sha256") to checksum the
+                output files and stdout/stderr with on the worker, right after the command
+                finishes. The future of a call then returns a dict of output id -> hex
+                digest(s); stored outputs carry theirs in OutputHandle.checksum.
+            manifest (Optional[str]): Append the checksums of every call to this file, in
+                the `sha256sum` format. Checksums default to sha256 if a manifest is given.
+                Outputs kept in the output store go to `<manifest>.stored`, by name.
+            router (Optional[ExecutorRouter]): Chooses the Parsl executors of each call from
+                the tool's `ParslExecutor` hint and the router's rules. Without a router
+                calls go to the hinted executor, or to all executors.
         """
+        if manifest is not None and checksum is None:
+            checksum = "sha256"
+
+        if checksum is not None:
+            # fail on the driver, not on every worker, if the algorithm is unknown
+            hashlib.new(checksum)
 
-        with open(cwl_file, "r", encoding="utf-8") as f:
-            cwl = yaml.safe_load(f)
+        cwl_path, _, tool_id = cwl_file.partition("#")
+        if tool_id:
+            cwl = load_document(cwl_path)
+        else:
+            with open(cwl_file, "r", encoding="utf-8") as f:
+                cwl = yaml.safe_load(f)
+
+        # a packed file without a fragment is its main tool, as in cwltool
+        if tool_id or (isinstance(cwl, dict) and "$graph" in cwl):
+            try:
+                cwl = tool_document(cwl, tool_id or "main")
+
+            except KeyError as e:
+                raise InvalidCWL(f"{cwl_path}: {e.args[0]}") from None
 
         self.validate_cwl(cwl)
 
         self.__file = cwl_file
+        # resolved once, the tool keeps its identity if the driver changes directory
+        self.__path = os.path.abspath(cwl_file)
         self.__cwl = cwl
         self.__version = self.__cwl["cwlVersion"]
         self.__base_command = None
         self.__inputs: List[InputArgument] = None
         self.__outputs: List[OutputArgument] = None
+        self.__output_store = output_store
+        self.__checksum = checksum
+        self.__manifest = manifest
+        self.__router = router if router is not None else ExecutorRouter()
+        self.__executor_hint: Dict[str, Any] = {}
+        self.__stdout: Optional[Expression] = None
+        self.__stderr: Optional[Expression] = None
+        self.__stdin: Optional[Expression] = None
+        self.__command_line: List[Union[InputArgument, CommandArgument]] = None
+        self.__unbound_inputs = set()
 
         self.__set_cwl_args__()
 
@@ -210,9 +370,50 @@ class CWLApp:
         else:
             self.__base_command = self.__cwl["baseCommand"]
 
-        self.__set_inputs(self.__cwl["inputs"])
-        if "outputs" in self.__cwl:
-            self.__set_outputs(self.__cwl["outputs"])
+        try:
+            self.__stdout = compile_expression(self.__cwl.get("stdout"))
+            self.__stderr = compile_expression(self.__cwl.get("stderr"))
+            self.__stdin = compile_expression(self.__cwl.get("stdin"))
+            self.__set_inputs(self.__cwl["inputs"])
+            if "outputs" in self.__cwl:
+                self.__set_outputs(self.__cwl["outputs"])
+
+            self.__set_command_line(self.__cwl.get("arguments", []))
+            self.__check_references()
+
+        except InvalidExpression as e:
+            raise InvalidCWL(f"Invalid Cwl File for Command Line Tools\n{e}") from None
+
+        self.__set_executor_hint(self.__cwl.get("hints", {}))
+
+        arg_ids = [arg.arg_id for arg in self.__inputs] + [arg.arg_id for arg in self.__outputs]
+        if self.EXECUTOR_KWARG in arg_ids:
+            raise InvalidCWL(f"'{self.EXECUTOR_KWARG}' is reserved and cannot be an argument id")
+
+    def __check_references(self) -> None:
+        """Check every parameter reference names a declared input
+
+        Raises:
+            InvalidExpression: if a reference names an input the tool does not have
+        """
+        expressions = [self.__stdout, self.__stderr, self.__stdin]
+        expressions.extend(input_arg.value_from for input_arg in self.__inputs)
+        expressions.extend(output_arg.glob for output_arg in self.__outputs)
+        expressions.extend(
+            arg.value_from for arg in self.__command_line if isinstance(arg, CommandArgument)
+        )
+
+        input_ids = {input_arg.arg_id for input_arg in self.__inputs}
+        for expression in expressions:
+            if expression is None:
+                continue
+
+            unknown = [arg_id for arg_id in expression.input_ids if arg_id not in input_ids]
+            if unknown:
+                raise InvalidExpression(
+                    f"{expression.source}: no input with id '{unknown[0]}', expected one of"
+                    f" {sorted(input_ids)}"
+                )
 
     def __str__(self) -> str:
         return pprint.pformat(self.__cwl)
@@ -224,21 +425,104 @@ class CWLApp:
 
         Make sure to use the same names for function parameters as
         the input and output arguments in the CWL file.
+
+        With an output store, stdout/stderr arguments are optional and name the
+        stored outputs rather than files.
+
+        Pass `parsl_executor=<label>` to send this call to a specific Parsl executor.
         """
+        # parsl is imported here rather than at module level so that validating
+        # and rendering tools (e.g. `python -m cwl validate`) stays fast
+        from parsl.app.app import bash_app, python_app
+
+        executors = self.get_executors(kwargs.pop(self.EXECUTOR_KWARG, None))
+
+        if self.__output_store is not None or self.__checksum is not None:
+            args = self.__get_parsl_bash_app_args(**kwargs)
+            if self.__checksum is not None:
+                args["checksum"] = self.__checksum
+                args["checksum_paths"] = self.__get_checksum_paths(**kwargs)
+
+            if self.__output_store is not None:
+                future = python_app(run_command_to_store, executors=executors)(
+                    store=self.__output_store, **args
+                )
+            else:
+                future = python_app(run_command_with_checksums, executors=executors)(**args)
 
-        @bash_app
+            if self.__manifest is not None:
+                future.add_done_callback(partial(self.__write_manifest, args["checksum_paths"]))
+
+            return future
+
+        @bash_app(executors=executors)
         def __parsl_bash_app__(
             command: str,
             stdout: str = None,
             stderr: str = None,
-            inputs: List[File] = None,
-            outputs: List[File] = None,
+            inputs: List[Any] = None,
+            outputs: List[Any] = None,
         ) -> str:
             return command
 
         args = self.__get_parsl_bash_app_args(**kwargs)
+
+        # bash_app has no stdin argument, so the shell streams the file in
+        stdin = args.pop("stdin")
+        if stdin is not None:
+            args["command"] = f"{args['command']} < {shlex.quote(stdin)}"
+
         return __parsl_bash_app__(**args)
 
+    def get_executors(self, executor: Optional[str] = None) -> Executors:
+        """Parsl executors a call is submitted to
+
+        Args:
+            executor (Optional[str]): Executor label passed to the call
+
+        Returns:
+            Executors: executor labels, or "all"
+        """
+        return self.__router.route(
+            self.cwl_file,
+            self.__executor_hint.get("label"),
+            self.__executor_hint.get("cost"),
+            executor,
+        )
+
+    def __set_executor_hint(self, hints: Union[List[Dict[str, Any]], Dict[str, Any]]) -> None:
+        """Set the executor label and cost from the tool's `ParslExecutor` hint
+
+        Args:
+            hints (Union[List[Dict[str, Any]], Dict[str, Any]]): CWL hints
+        """
+        if isinstance(hints, list):
+            hint = next(
+                (h for h in hints if isinstance(h, dict) and h.get("class") == self.EXECUTOR_HINT),
+                None,
+            )
+
+        else:
+            hint = hints.get(self.EXECUTOR_HINT)
+
+        if hint is None:
+            return
+
+        if not isinstance(hint, dict):
+            raise InvalidCWL(
+                f"Invalid {self.EXECUTOR_HINT} hint: should be a mapping with 'label' and/or 'cost'"
+            )
+
+        label = hint.get("label")
+        cost = hint.get("cost")
+        if label is not None and not isinstance(label, str):
+            raise InvalidCWL(f"Invalid {self.EXECUTOR_HINT} hint: 'label' should be a string")
+
+        if cost is not None and (isinstance(cost, bool) or not isinstance(cost, (int, float))):
+            raise InvalidCWL(f"Invalid {self.EXECUTOR_HINT} hint: 'cost' should be a number")
+
+        self.__executor_hint = {"label": label, "cost": cost}
+
     @classmethod
     def validate_cwl(cls, cwl_content: Dict[str, any]) -> Dict[str, any]:
         """Check if CWL is valid.
@@ -259,6 +543,7 @@ class CWLApp:
                 Opt("prefix"): str,
                 Opt("separate"): bool,
                 Opt("itemSeparator"): str,
+                Opt("valueFrom"): str,
             },
             len,
             error="Empty inputBinding.",
@@ -309,6 +594,25 @@ class CWLApp:
                     lambda cls: cls == "CommandLineTool",
                     error="Invalid type for class. Should be 'CommandLineTool'.",
                 ),
+                Opt("stdout"): str,
+                Opt("stderr"): str,
+                Opt("stdin"): str,
+                Opt("arguments"): [
+                    Or(
+                        str,
+                        And(
+                            {
+                                Opt("valueFrom"): str,
+                                Opt("position"): int,
+                                Opt("prefix"): str,
+                                Opt("separate"): bool,
+                                Opt("shellQuote"): bool,
+                            },
+                            lambda arg: "valueFrom" in arg or "prefix" in arg,
+                        ),
+                        error="Invalid argument. Should be a string or have valueFrom/prefix.",
+                    )
+                ],
                 "inputs": Or(
                     {
                         Regex(
@@ -327,7 +631,7 @@ class CWLApp:
                             "id": Regex(
                                 r"^[a-zA-Z_][a-zA-Z0-9_]*$",
                             ),
-                            "type": input_simple_types,
+                            "type": input_types_schema,
                             Opt("items"): Or(*input_simple_types),
                             Opt("default"): Or(
                                 int, float, str, bool, list, error="Invalid default value"
@@ -381,6 +685,11 @@ class CWLApp:
         inputs = []
 
         def process_input(arg_id, input_arg):
+            # inputs without an inputBinding are not on the command line, but can be
+            # referenced by other arguments
+            if "inputBinding" not in input_arg:
+                self.__unbound_inputs.add(arg_id)
+
             if input_arg["type"] == "array":
                 arg_type = input_arg["items"]
                 array = True
@@ -395,6 +704,7 @@ class CWLApp:
             prefix = input_arg.get("inputBinding", {}).get("prefix", None)
             item_separator = input_arg.get("inputBinding", {}).get("itemSeparator", None)
             separate = input_arg.get("inputBinding", {}).get("separate", True)
+            value_from = compile_expression(input_arg.get("inputBinding", {}).get("valueFrom"))
 
             return InputArgument(
                 arg_id,
@@ -406,6 +716,7 @@ class CWLApp:
                 prefix,
                 item_separator,
                 separate,
+                value_from,
             )
 
         if isinstance(cwl_inputs, list):
@@ -437,7 +748,13 @@ class CWLApp:
                 arg_type = output_arg["type"].rstrip("[]")
                 array = "[]" in output_arg["type"]
 
-            return OutputArgument(arg_id, arg_type, array)
+            glob = None
+            if isinstance(output_arg.get("outputBinding"), dict):
+                glob = output_arg["outputBinding"].get("glob")
+                if glob is not None and not isinstance(glob, str):
+                    raise InvalidExpression(f"{arg_id}: outputBinding.glob should be a string")
+
+            return OutputArgument(arg_id, arg_type, array, compile_expression(glob))
 
         if isinstance(cwl_outputs, list):
             outputs.extend(
@@ -451,6 +768,38 @@ class CWLApp:
 
         self.__outputs = outputs
 
+    def __set_command_line(self, cwl_arguments: List[Union[str, Dict[str, Any]]]) -> None:
+        """Set the render plan: inputs with an inputBinding and `arguments`, sorted by position
+
+        As in CWL, a missing position is 0, and ties go to `arguments` in the order
+        they are listed, then to inputs by id.
+
+        Args:
+            cwl_arguments (List[Union[str, Dict[str, Any]]]): CWL arguments
+        """
+        command_line = [
+            ((input_arg.position or 0, 1, input_arg.arg_id), input_arg)
+            for input_arg in self.__inputs
+            if input_arg.arg_id not in self.__unbound_inputs
+        ]
+
+        for index, argument in enumerate(cwl_arguments):
+            if isinstance(argument, str):
+                command_argument = CommandArgument(compile_expression(argument))
+
+            else:
+                command_argument = CommandArgument(
+                    compile_expression(argument.get("valueFrom", "")),
+                    argument.get("position", 0),
+                    argument.get("prefix", None),
+                    argument.get("separate", True),
+                )
+
+            command_line.append(((command_argument.position, 0, index), command_argument))
+
+        command_line.sort(key=lambda entry: entry[0])
+        self.__command_line = [arg for _, arg in command_line]
+
     @property
     def command_template(self) -> str:
         """Synopsis/Template for the command.
@@ -460,14 +809,24 @@ class CWLApp:
         """
         return (
             f"COMMAND TEMPLATE:\n{self.__base_command} "
-            f"{' '.join([input_arg.to_string_template() for input_arg in self.__inputs])}"
+            f"{' '.join([arg.to_string_template() for arg in self.__command_line])}"
         )
 
+    @property
+    def outputs(self) -> List[OutputArgument]:
+        """Output arguments of the tool"""
+        return list(self.__outputs)
+
     @property
     def cwl_version(self) -> str:
         """CWL version"""
         return self.__version
 
+    @property
+    def cwl_file(self) -> str:
+        """Absolute path of the CWL file, with the #tool_id of a tool in a packed file"""
+        return self.__path
+
     @property
     def cwl_file_name(self) -> str:
         """CWL file name"""
@@ -481,13 +840,34 @@ class CWLApp:
         Returns:
             str: string of the shell command that is to be run
         """
-        input_args = []
+        values = self.__input_values(kwargs)
+
         for input_arg in self.__inputs:
-            if input_arg.arg_id in kwargs:
-                input_args.append(input_arg.to_string(kwargs[input_arg.arg_id]))
+            if (
+                input_arg.arg_id in self.__unbound_inputs
+                and input_arg.arg_id not in kwargs
+                and input_arg.default is None
+                and not input_arg.optional
+            ):
+                raise ArgumentMissing(f"missing required value for argument: {input_arg.arg_id}")
 
-            elif input_arg.default:
-                input_args.append(input_arg.to_string())
+        input_args = []
+        for input_arg in self.__command_line:
+            if isinstance(input_arg, CommandArgument):
+                arg_string = input_arg.to_string(values)
+                if arg_string:
+                    input_args.append(arg_string)
+
+            elif input_arg.arg_id in kwargs:
+                arg_string = input_arg.to_string(kwargs[input_arg.arg_id], values)
+                if arg_string:
+                    input_args.append(arg_string)
+
+            elif input_arg.default is not None:
+                # `default: 0`, `false` or `""` are defaults too
+                arg_string = input_arg.to_string(input_arg.default, values)
+                if arg_string:
+                    input_args.append(arg_string)
 
             elif input_arg.optional:
                 continue
@@ -497,6 +877,105 @@ class CWLApp:
 
         return f"{self.__base_command} {' '.join(input_args)}"
 
+    def missing_arguments(self, values: Dict[str, Any]) -> List[str]:
+        """Required input and output arguments that have no value
+
+        Args:
+            values (Dict[str, Any]): values for inputs and outputs mentioned in the CWL file
+
+        Returns:
+            List[str]: ids of the required arguments missing from values
+        """
+        missing = [
+            input_arg.arg_id
+            for input_arg in self.__inputs
+            if input_arg.arg_id not in values
+            and input_arg.default is None
+            and not input_arg.optional
+        ]
+        missing.extend(
+            output_arg.arg_id
+            for output_arg in self.__outputs
+            if output_arg.arg_type in ("stdout", "stderr", "File")
+            and output_arg.arg_id not in values
+            and not (output_arg.arg_type == "stdout" and self.__stdout is not None)
+            and not (output_arg.arg_type == "stderr" and self.__stderr is not None)
+            and not self.__glob_resolves(output_arg, values)
+        )
+
+        return missing
+
+    def __glob_resolves(self, output_arg: OutputArgument, values: Dict[str, Any]) -> bool:
+        """True if the output can be left out of a call: its glob names the files"""
+        if output_arg.arg_type != "File" or output_arg.glob is None:
+            return False
+
+        try:
+            return self.__glob_paths(output_arg, self.__input_values(values)) is not None
+
+        except (ArgumentMissing, InvalidExpression):
+            # the missing input is reported, or values are not call values (a job file)
+            return True
+
+    @staticmethod
+    def __glob_paths(output_arg: OutputArgument, values: Dict[str, Any]) -> Optional[List[str]]:
+        """Paths named by the glob of an output, None if it has wildcards
+
+        Wildcard patterns only match files once the command has run, but Parsl needs the
+        output Files up front.
+        """
+        paths = output_arg.glob.evaluate(values, required=True)
+        paths = paths if isinstance(paths, list) else [paths]
+        paths = [os.fspath(getattr(path, "filepath", path)) for path in paths]
+
+        if any(char in path for path in paths for char in "*?["):
+            return None
+
+        return paths
+
+    def __input_values(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Value of every input for a call, with defaults applied, for parameter references"""
+        return {
+            input_arg.arg_id: kwargs.get(input_arg.arg_id, input_arg.default)
+            for input_arg in self.__inputs
+        }
+
+    def __resolve_outputs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in outputs left out of a call from the tool's stdout/stderr and glob
+
+        Args:
+            kwargs (Dict[str, Any]): values for inputs and outputs of the call
+
+        Returns:
+            Dict[str, Any]: kwargs with the outputs that could be resolved
+        """
+        from parsl.data_provider.files import File
+
+        unresolved = [
+            output_arg for output_arg in self.__outputs if output_arg.arg_id not in kwargs
+        ]
+        if not unresolved:
+            return kwargs
+
+        kwargs = dict(kwargs)
+        values = self.__input_values(kwargs)
+        for output_arg in unresolved:
+            if output_arg.arg_type == "stdout" and self.__stdout is not None:
+                kwargs[output_arg.arg_id] = str(self.__stdout.evaluate(values, required=True))
+
+            elif output_arg.arg_type == "stderr" and self.__stderr is not None:
+                kwargs[output_arg.arg_id] = str(self.__stderr.evaluate(values, required=True))
+
+            elif output_arg.arg_type == "File" and output_arg.glob is not None:
+                paths = self.__glob_paths(output_arg, values)
+                if paths is None:
+                    continue
+
+                files = [File(path) for path in paths]
+                kwargs[output_arg.arg_id] = files if output_arg.array else files[0]
+
+        return kwargs
+
     def __get_parsl_bash_app_args(self, **kwargs) -> Dict[str, Any]:
         """Args needed to run the command using Parsl
 
@@ -507,10 +986,17 @@ class CWLApp:
                     "command": str,
                     "stdout": File,
                     "stderr": File,
+                    "stdin": str,
                     "inputs": [File],
                     "outputs": [File],
                 }
+            With an output store "stdout" and "stderr" are replaced by
+                    "streams": {output id: ("stdout" | "stderr", stored name)}
         """
+        from parsl.app.futures import DataFuture
+        from parsl.data_provider.files import File
+
+        kwargs = self.__resolve_outputs(kwargs)
 
         def handle_input_output_files(file):
             if file.arg_type == "File" and file.arg_id in kwargs:
@@ -538,9 +1024,15 @@ class CWLApp:
         # Check if all the output arguments are provided
         stdout = None
         stderr = None
+        streams = {}
         for output_arg in self.__outputs:
+            # stored outputs are named after the call's value, or get a unique name
+            if self.__output_store is not None and output_arg.arg_type in ("stdout", "stderr"):
+                name = kwargs.get(output_arg.arg_id, f"{uuid.uuid4().hex}.{output_arg.arg_id}")
+                streams[output_arg.arg_id] = (output_arg.arg_type, str(name))
+
             # handle stdout and stderr
-            if output_arg.arg_type == "stdout":
+            elif output_arg.arg_type == "stdout":
                 if output_arg.arg_id not in kwargs:
                     raise ArgumentMissing("missing required value for argument: stdout")
 
@@ -565,6 +1057,20 @@ class CWLApp:
         for file in self.__outputs:
             output_files.extend(handle_input_output_files(file))
 
+        # stdout/stderr/stdin named by the tool, when not captured as an output
+        values = self.__input_values(kwargs)
+        stored_streams = {stream for stream, _ in streams.values()}
+        if stdout is None and self.__stdout is not None and "stdout" not in stored_streams:
+            stdout = str(self.__stdout.evaluate(values, required=True))
+
+        if stderr is None and self.__stderr is not None and "stderr" not in stored_streams:
+            stderr = str(self.__stderr.evaluate(values, required=True))
+
+        stdin = None
+        if self.__stdin is not None:
+            stdin = self.__stdin.evaluate(values, required=True)
+            stdin = os.fspath(getattr(stdin, "filepath", stdin))
+
         # get command string
         command = self.get_command(**kwargs)
 
@@ -572,14 +1078,102 @@ class CWLApp:
             "command": command,
             "stdout": stdout,
             "stderr": stderr,
+            "stdin": stdin,
             "inputs": input_files,
             "outputs": output_files,
         }
 
+        if self.__output_store is not None:
+            # files named by the tool's stdout/stderr are written as Parsl would (appended)
+            redirects = [
+                f"{operator} {shlex.quote(os.fspath(path))}"
+                for operator, path in ((">>", stdout), ("2>>", stderr))
+                if path is not None
+            ]
+            cmd_args["command"] = " ".join([command, *redirects])
+
+            del cmd_args["stdout"], cmd_args["stderr"]
+            cmd_args["streams"] = streams
+
         return cmd_args
 
-    def __run_local(self, **kwargs):
-        """Local run of the command"""
-        print("RESULT OF RUNNING COMMAND LINE TOOL:")
-        exit_code = os.system(self.get_command(**kwargs))
-        print(f"EXIT CODE: {exit_code}")
+    def plan(self, **kwargs) -> Dict[str, Any]:
+        """Dry run of a call: process the arguments and render the command, submit nothing
+
+        kwargs: values for inputs and outputs mentioned in the CWL file
+
+        Raises:
+            ArgumentMissing, TypeError: the same errors the call would raise
+
+        Returns:
+            Dict[str, Any]: Args the call would pass to Parsl, see __get_parsl_bash_app_args
+        """
+        return self.__get_parsl_bash_app_args(**kwargs)
+
+    def __get_checksum_paths(self, **kwargs) -> Dict[str, Union[str, List[str]]]:
+        """Paths of the outputs to checksum on the worker
+
+        kwargs: values for inputs and outputs mentioned in the CWL file
+
+        Returns:
+            Dict[str, Union[str, List[str]]]: output id -> path(s). stdout/stderr kept in an
+                output store are checksummed by the store instead.
+        """
+        kwargs = self.__resolve_outputs(kwargs)
+
+        checksum_paths = {}
+        for output_arg in self.__outputs:
+            if output_arg.arg_id not in kwargs:
+                continue
+
+            value = kwargs[output_arg.arg_id]
+            if output_arg.arg_type in ("stdout", "stderr"):
+                if self.__output_store is None:
+                    checksum_paths[output_arg.arg_id] = os.fspath(value)
+
+            elif output_arg.arg_type == "File":
+                if output_arg.array:
+                    checksum_paths[output_arg.arg_id] = [f.filepath for f in value]
+                else:
+                    checksum_paths[output_arg.arg_id] = value.filepath
+
+        return checksum_paths
+
+    def __write_manifest(self, checksum_paths: Dict[str, Union[str, List[str]]], future) -> None:
+        """Append the checksums of a finished call to the manifest"""
+        if future.exception() is not None:
+            return
+
+        checksums = {}
+        stored = {}
+        for arg_id, value in future.result().items():
+            if isinstance(value, OutputHandle):
+                stored[value.name] = value.checksum
+
+            elif isinstance(value, list):
+                checksums.update(zip(checksum_paths[arg_id], value))
+
+            else:
+                checksums[checksum_paths[arg_id]] = value
+
+        if checksums:
+            write_manifest(self.__manifest, checksums)
+
+        if stored:
+            write_manifest(self.__manifest + self.STORED_MANIFEST_SUFFIX, stored)
+
+    def run_local(self, **kwargs) -> int:
+        """Run the command in a subprocess on this machine, without Parsl
+
+        kwargs: values for inputs and outputs mentioned in the CWL file
+
+        Returns:
+            int: exit code of the command
+        """
+        args = self.__get_parsl_bash_app_args(**kwargs)
+        if self.__output_store is not None:
+            return self.__output_store.run(args["command"], args["streams"], stdin=args["stdin"])[0]
+
+        return run_command(
+            args["command"], stdout=args["stdout"], stderr=args["stderr"], stdin=args["stdin"]
+        )
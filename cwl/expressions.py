@@ -0,0 +1,289 @@
+"""CWL parameter references, e.g. `$(inputs.sample).txt` or `$(inputs.files[0].basename)`
+
+Each string is parsed once, when the tool is loaded, into literal text and compiled
+accessors. Evaluating it for a call is then a few dict/attribute/index lookups: there
+is no string scanning and no JavaScript engine per invocation.
+"""
+
+import os
+import re
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+SYMBOLS = ("inputs", "self")
+
+# one segment of a reference: .name, ['name'], ["name"] or [0]
+_SEGMENT = re.compile(r"""\.([A-Za-z_][A-Za-z0-9_]*)|\['([^']*)'\]|\["([^"]*)"\]|\[(\d+)\]""")
+_SYMBOL = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class InvalidExpression(Exception):
+    """Exception for an invalid or unsupported parameter reference"""
+
+    def __init__(self, message: str) -> None:
+        """Exception for an invalid or unsupported parameter reference
+
+        Args:
+            message (str): Error message
+        """
+        super().__init__(message)
+
+
+def _file_property(value: Any, name: str) -> Any:
+    """CWL File properties of a Parsl File (or DataFuture)"""
+    path = os.fspath(value.filepath)
+    if name == "path":
+        return path
+
+    basename = os.path.basename(path)
+    if name == "basename":
+        return basename
+
+    if name == "dirname":
+        return os.path.dirname(path)
+
+    if name == "nameroot":
+        return os.path.splitext(basename)[0]
+
+    if name == "nameext":
+        return os.path.splitext(basename)[1]
+
+    return getattr(value, name)
+
+
+class _Field:
+    """Accessor for a named field of a value (a class rather than a closure, to pickle)"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return value[self.name]
+
+        if self.name == "length" and isinstance(value, (list, tuple)):
+            return len(value)
+
+        if hasattr(value, "filepath"):
+            return _file_property(value, self.name)
+
+        return getattr(value, self.name)
+
+
+class Reference:
+    """A compiled parameter reference: a symbol and a chain of accessors"""
+
+    __slots__ = ("source", "symbol", "accessors")
+
+    def __init__(self, source: str, symbol: str, accessors: Tuple[Callable[[Any], Any], ...]):
+        """A compiled parameter reference
+
+        Args:
+            source (str): Text of the reference, e.g. inputs.files[0].path
+            symbol (str): inputs or self
+            accessors (Tuple[Callable[[Any], Any], ...]): Lookups applied in order
+        """
+        self.source = source
+        self.symbol = symbol
+        self.accessors = accessors
+
+    def __repr__(self) -> str:
+        return f"$({self.source})"
+
+    @property
+    def argument(self) -> str:
+        """id of the referenced input, or the reference itself if it is not an input"""
+        if self.symbol == "inputs" and self.accessors and isinstance(self.accessors[0], _Field):
+            return self.accessors[0].name
+
+        return f"$({self.source})"
+
+    def evaluate(self, inputs: Dict[str, Any], self_value: Any = None) -> Any:
+        """Value of the reference, None if it goes through a missing (None) value"""
+        value = inputs if self.symbol == "inputs" else self_value
+        try:
+            for accessor in self.accessors:
+                if value is None:
+                    return None
+
+                value = accessor(value)
+
+        except (AttributeError, IndexError, KeyError, TypeError) as e:
+            raise InvalidExpression(f"cannot evaluate $({self.source}): {e!r}") from None
+
+        return value
+
+
+def _compile_reference(source: str) -> Reference:
+    """Compile the text between `$(` and `)`"""
+    symbol = _SYMBOL.match(source)
+    if symbol is None or symbol.group() not in SYMBOLS:
+        raise InvalidExpression(
+            f"unsupported parameter reference $({source}): should start with "
+            + " or ".join(SYMBOLS)
+        )
+
+    accessors = []
+    pos = symbol.end()
+    while pos < len(source):
+        segment = _SEGMENT.match(source, pos)
+        if segment is None:
+            raise InvalidExpression(
+                f"unsupported parameter reference $({source}): only .field, ['field'] and"
+                " [index] lookups are supported, not JavaScript expressions"
+            )
+
+        attr, single, double, index = segment.groups()
+        if index is not None:
+            accessors.append(itemgetter(int(index)))
+        else:
+            accessors.append(_Field(next(s for s in (attr, single, double) if s is not None)))
+
+        pos = segment.end()
+
+    return Reference(source, symbol.group(), tuple(accessors))
+
+
+class Expression:
+    """A string with parameter references, compiled once and evaluated per call"""
+
+    __slots__ = ("source", "parts")
+
+    def __init__(self, source: str) -> None:
+        """A string with parameter references
+
+        Args:
+            source (str): e.g. `$(inputs.sample).txt`
+
+        Raises:
+            InvalidExpression: if a reference is malformed or uses JavaScript
+        """
+        self.source = source
+        self.parts: List[Union[str, Reference]] = []
+
+        if "${" in source:
+            raise InvalidExpression(f"JavaScript expressions are not supported: {source}")
+
+        literal = ""
+        pos = 0
+        while pos < len(source):
+            start = source.find("$(", pos)
+            if start == -1:
+                literal += source[pos:]
+                break
+
+            # \$( is a literal $(
+            if start > 0 and source[start - 1] == "\\":
+                literal += source[pos : start - 1] + "$("
+                pos = start + 2
+                continue
+
+            end = source.find(")", start)
+            if end == -1:
+                raise InvalidExpression(f"unterminated parameter reference: {source}")
+
+            literal += source[pos:start]
+            if literal:
+                self.parts.append(literal)
+                literal = ""
+
+            self.parts.append(_compile_reference(source[start + 2 : end].strip()))
+            pos = end + 1
+
+        if literal:
+            self.parts.append(literal)
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+    @property
+    def is_constant(self) -> bool:
+        """True if the string has no parameter references"""
+        return all(isinstance(part, str) for part in self.parts)
+
+    @property
+    def input_ids(self) -> List[str]:
+        """ids of the inputs referenced by name, e.g. `sample` for `$(inputs.sample).txt`"""
+        return [
+            part.accessors[0].name
+            for part in self.parts
+            if isinstance(part, Reference)
+            and part.symbol == "inputs"
+            and part.accessors
+            and isinstance(part.accessors[0], _Field)
+        ]
+
+    def evaluate(
+        self, inputs: Dict[str, Any], self_value: Any = None, required: bool = False
+    ) -> Any:
+        """Value of the string for a call
+
+        A string that is a single reference evaluates to the referenced value as is
+        (e.g. a list of filenames), otherwise the parts are joined as a string.
+
+        Args:
+            inputs (Dict[str, Any]): input id -> value of the call
+            self_value (Any): value of `self`, for valueFrom
+            required (bool): Raise if a single reference evaluates to None, rather than
+                return None (e.g. for stdout, where CWL has no "leave it out")
+
+        Raises:
+            ArgumentMissing: if a reference joined into a string, or a required single
+                reference, has no value (an optional input left out of the call)
+
+        Returns:
+            Any: value of the string
+        """
+        parts = self.parts
+        if len(parts) == 1 and isinstance(parts[0], Reference):
+            value = parts[0].evaluate(inputs, self_value)
+            if value is None and required:
+                _missing(parts[0])
+
+            return value
+
+        strings = []
+        for part in parts:
+            if isinstance(part, Reference):
+                value = part.evaluate(inputs, self_value)
+                if value is None:
+                    _missing(part)
+
+                part = _to_string(value)
+
+            strings.append(part)
+
+        return "".join(strings)
+
+
+def _missing(reference: Reference) -> None:
+    """Raise ArgumentMissing for a reference without a value"""
+    # imported here as cwl.cwl_app compiles its strings through this module
+    from cwl.cwl_app import ArgumentMissing
+
+    raise ArgumentMissing(f"missing required value for argument: {reference.argument}")
+
+
+def _to_string(value: Any) -> str:
+    """String interpolation of a referenced value"""
+    if hasattr(value, "filepath"):
+        return os.fspath(value.filepath)
+
+    return str(value)
+
+
+def compile_expression(source: Optional[str]) -> Optional[Expression]:
+    """Compile a string that may contain parameter references
+
+    Args:
+        source (Optional[str]): String from the CWL file
+
+    Returns:
+        Optional[Expression]: compiled string, None if source is None
+    """
+    if source is None:
+        return None
+
+    return Expression(source)
@@ -0,0 +1,137 @@
+"""Packed CWL documents: many CommandLineTools in one file under `$graph`
+
+```yml
+cwlVersion: v1.0
+$graph:
+  - id: wc
+    class: CommandLineTool
+    ...
+  - id: touch
+    class: CommandLineTool
+    ...
+```
+
+A packed file is read and parsed once per process. Its tools are only validated and
+built when first requested, as `CWLApp("tools.cwl#wc")` or `CWLGraph("tools.cwl")["wc"]`.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterator, List
+
+import yaml
+
+_documents: Dict[str, Dict[str, Any]] = {}
+_documents_lock = threading.Lock()
+
+
+def load_document(cwl_file: str) -> Dict[str, Any]:
+    """Parsed CWL file, read once per process
+
+    Args:
+        cwl_file (str): Path of the CWL file
+
+    Returns:
+        Dict[str, Any]: parsed document. Shared, do not modify.
+    """
+    path = os.path.abspath(cwl_file)
+    with _documents_lock:
+        if path not in _documents:
+            with open(path, "r", encoding="utf-8") as f:
+                _documents[path] = yaml.safe_load(f)
+
+        return _documents[path]
+
+
+def _short_id(arg_id: str) -> str:
+    """`#wc/text_file` or `wc/text_file` -> `text_file`, as written by `cwltool --pack`"""
+    return arg_id.rsplit("/", 1)[-1].lstrip("#")
+
+
+def _tool_ids(document: Dict[str, Any]) -> List[str]:
+    return [_short_id(str(process.get("id", ""))) for process in document.get("$graph", [])]
+
+
+def tool_document(document: Dict[str, Any], tool_id: str) -> Dict[str, Any]:
+    """A single tool of a packed document, as if it was its own CWL file
+
+    Args:
+        document (Dict[str, Any]): Parsed packed document
+        tool_id (str): id of the tool, with or without the leading `#`
+
+    Raises:
+        KeyError: if the document has no process with this id
+
+    Returns:
+        Dict[str, Any]: CWL of the tool. The tool inherits the document's cwlVersion
+            and list-form input/output ids are shortened to the argument names.
+    """
+    tool_id = tool_id.lstrip("#")
+    processes = document.get("$graph", [document])
+    tool = next((p for p in processes if _short_id(str(p.get("id", ""))) == tool_id), None)
+    if tool is None:
+        raise KeyError(f"no tool with id '{tool_id}', expected one of {_tool_ids(document)}")
+
+    tool = {key: value for key, value in tool.items() if key != "id"}
+    if "cwlVersion" not in tool and "cwlVersion" in document:
+        tool["cwlVersion"] = document["cwlVersion"]
+
+    for section in ("inputs", "outputs"):
+        if isinstance(tool.get(section), list):
+            tool[section] = [
+                {**arg, "id": _short_id(arg["id"])} if isinstance(arg.get("id"), str) else arg
+                for arg in tool[section]
+            ]
+
+    return tool
+
+
+class CWLGraph:
+    """The tools of a packed CWL document, built as CWLApps on first use"""
+
+    def __init__(self, cwl_file: str, **app_options: Any) -> None:
+        """The tools of a packed CWL document
+
+        Args:
+            cwl_file (str): Packed CWL file with a `$graph` list of CommandLineTools
+            app_options: Keyword arguments for every CWLApp built, e.g. router
+        """
+        self.__file = cwl_file
+        self.__document = load_document(cwl_file)
+        self.__app_options = app_options
+        self.__apps: Dict[str, Any] = {}
+        self.__lock = threading.Lock()
+
+    def __getitem__(self, tool_id: str):
+        """CWLApp for a tool of the document, validated and built on first use
+
+        Raises:
+            KeyError: if the document has no tool with this id
+            InvalidCWL: if the tool is invalid
+        """
+        # imported here as CWLApp itself loads `file.cwl#id` through this module
+        from cwl.cwl_app import CWLApp
+
+        tool_id = tool_id.lstrip("#")
+        with self.__lock:
+            if tool_id not in self.__apps:
+                if tool_id not in self.ids:
+                    raise KeyError(f"no tool with id '{tool_id}' in {self.__file}")
+
+                self.__apps[tool_id] = CWLApp(f"{self.__file}#{tool_id}", **self.__app_options)
+
+            return self.__apps[tool_id]
+
+    def __contains__(self, tool_id: str) -> bool:
+        return tool_id.lstrip("#") in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def ids(self) -> List[str]:
+        """ids of the processes in the document"""
+        return _tool_ids(self.__document)
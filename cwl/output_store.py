@@ -0,0 +1,222 @@
+"""Consolidated store for stdout/stderr of many tool invocations
+
+Instead of one file per stream per invocation, every worker appends the output of
+the commands it runs to its own segment files and records where each output landed
+in its own index file. A run of millions of tasks then creates a handful of large,
+sequentially written files per worker instead of millions of small ones.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+from cwl.checksums import file_checksum
+
+
+class OutputHandle:
+    """Location of one stored output. The data is only read on request."""
+
+    __slots__ = ("name", "stream", "path", "offset", "length", "checksum")
+
+    def __init__(
+        self,
+        name: str,
+        stream: str,
+        path: str,
+        offset: int,
+        length: int,
+        checksum: Optional[str] = None,
+    ) -> None:
+        """Location of one stored output
+
+        Args:
+            name (str): Name the output was stored under
+            stream (str): stdout or stderr
+            path (str): Segment file holding the output
+            offset (int): Byte offset of the output in the segment file
+            length (int): Length of the output in bytes
+            checksum (Optional[str]): Hex digest of the output, if it was computed
+        """
+        self.name = name
+        self.stream = stream
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.checksum = checksum
+
+    def __repr__(self) -> str:
+        return str({slot: getattr(self, slot) for slot in self.__slots__})
+
+    def __str__(self) -> str:
+        return str({slot: getattr(self, slot) for slot in self.__slots__})
+
+    def __len__(self) -> int:
+        return self.length
+
+    def read(self) -> bytes:
+        """Contents of the output"""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(self.length)
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        """Contents of the output decoded as text"""
+        return self.read().decode(encoding)
+
+
+class OutputStore:
+    """Directory of per-worker segment and index files for stdout/stderr"""
+
+    INDEX_SUFFIX = ".index"
+
+    def __init__(self, root: str) -> None:
+        """Directory of per-worker segment and index files for stdout/stderr
+
+        Args:
+            root (str): Directory of the store. Must be reachable from the workers.
+        """
+        self.root = os.path.abspath(root)
+        self.__index: Dict[str, OutputHandle] = {}
+        self.__index_offsets: Dict[str, int] = {}
+        self.__index_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, str]:
+        # only the location travels to the workers, not the driver-side index cache
+        return {"root": self.root}
+
+    def __setstate__(self, state: Dict[str, str]) -> None:
+        self.root = state["root"]
+        self.__index = {}
+        self.__index_offsets = {}
+        self.__index_lock = threading.Lock()
+
+    def __worker_prefix(self) -> str:
+        """Prefix of the files owned by the calling worker
+
+        A thread runs one task at a time, so files keyed on host, process and thread
+        are only ever appended to by one writer.
+        """
+        return os.path.join(
+            self.root, f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+        )
+
+    def run(
+        self,
+        command: str,
+        streams: Dict[str, Tuple[str, str]],
+        checksum: Optional[str] = None,
+        stdin: Optional[str] = None,
+    ) -> Tuple[int, Dict[str, OutputHandle]]:
+        """Run a shell command, appending its stdout/stderr to this worker's segments
+
+        Args:
+            command (str): Shell command to run
+            streams (Dict[str, Tuple[str, str]]): output id -> (stdout or stderr, name to
+                store the output under)
+            checksum (Optional[str]): hashlib algorithm to checksum the outputs with
+            stdin (Optional[str]): File streamed into the command's stdin
+
+        Returns:
+            Tuple[int, Dict[str, OutputHandle]]: exit code, and output id -> stored output
+        """
+        os.makedirs(self.root, exist_ok=True)
+        prefix = self.__worker_prefix()
+
+        segments = {}
+        offsets = {}
+        stdin_file = None
+        try:
+            if stdin is not None:
+                stdin_file = open(stdin, "rb")
+
+            for stream in {stream for stream, _ in streams.values()}:
+                segments[stream] = open(f"{prefix}.{stream}", "ab")
+                offsets[stream] = segments[stream].seek(0, os.SEEK_END)
+
+            exit_code = subprocess.run(
+                command,
+                shell=True,
+                stdout=segments.get("stdout"),
+                stderr=segments.get("stderr"),
+                stdin=stdin_file,
+                check=False,
+            ).returncode
+
+            lengths = {
+                stream: segment.seek(0, os.SEEK_END) - offsets[stream]
+                for stream, segment in segments.items()
+            }
+
+        finally:
+            for segment in segments.values():
+                segment.close()
+
+            if stdin_file is not None:
+                stdin_file.close()
+
+        handles = {
+            arg_id: OutputHandle(
+                name, stream, f"{prefix}.{stream}", offsets[stream], lengths[stream]
+            )
+            for arg_id, (stream, name) in streams.items()
+        }
+
+        if checksum is not None:
+            for handle in handles.values():
+                handle.checksum = file_checksum(handle.path, checksum, handle.offset, handle.length)
+
+        records = "".join(
+            json.dumps({slot: getattr(handle, slot) for slot in OutputHandle.__slots__}) + "\n"
+            for handle in handles.values()
+        )
+        with open(prefix + self.INDEX_SUFFIX, "a", encoding="utf-8") as f:
+            f.write(records)
+
+        return exit_code, handles
+
+    def __load_index(self) -> None:
+        """Read the records appended to every worker's index file since the last load"""
+        if not os.path.isdir(self.root):
+            return
+
+        with self.__index_lock:
+            for entry in os.scandir(self.root):
+                if not entry.name.endswith(self.INDEX_SUFFIX):
+                    continue
+
+                offset = self.__index_offsets.get(entry.path, 0)
+                if entry.stat().st_size <= offset:
+                    continue
+
+                with open(entry.path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+
+                # a record still being written by a worker is read on a later load
+                complete = data.rfind(b"\n") + 1
+                for line in data[:complete].splitlines():
+                    record = json.loads(line)
+                    self.__index[record["name"]] = OutputHandle(**record)
+
+                self.__index_offsets[entry.path] = offset + complete
+
+    def get(self, name: str) -> Optional[OutputHandle]:
+        """Stored output by the name it was stored under
+
+        Args:
+            name (str): Name of the output
+
+        Returns:
+            Optional[OutputHandle]: the stored output, None if there is none with that name
+        """
+        if name not in self.__index:
+            self.__load_index()
+
+        return self.__index.get(name)
+
+    def __iter__(self) -> Iterator[OutputHandle]:
+        self.__load_index()
+        return iter(list(self.__index.values()))
@@ -0,0 +1,215 @@
+"""Dry run of many CWLApp calls: render every command and check for problems, submit nothing"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Linux limits a single argv string to 32 pages. bash_app runs `bash -c <command>`,
+# so the whole command line is one argument.
+MAX_COMMAND_LENGTH = 32 * 4096
+
+CHUNK_SIZE = 1000
+
+PlanError = namedtuple("PlanError", ["tool", "index", "error"])
+
+# an output: the absolute path of a file, or ("store", name) for stdout/stderr kept in
+# an OutputStore, as store names and file paths are separate namespaces
+OutputKey = Union[str, Tuple[str, str]]
+
+# result of planning one call: (index, error or None, outputs, command length)
+_PlannedCall = Tuple[int, Optional[str], List[OutputKey], int]
+
+
+class PlanReport:
+    """Summary of a dry run: calls per tool, errors and outputs written by more than one call"""
+
+    __slots__ = ("counts", "errors", "conflicts", "longest_command")
+
+    MAX_LISTED = 20
+
+    def __init__(self) -> None:
+        """Summary of a dry run
+
+        Attributes:
+            counts (Dict[str, int]): CWL file path -> number of calls
+            errors (List[PlanError]): calls that would fail before running
+            conflicts (Dict[OutputKey, List[Tuple[str, int]]]): output -> (tool, index) of
+                every call writing it, for outputs written by more than one call. Outputs
+                are absolute paths, or ("store", name) for outputs kept in an OutputStore.
+            longest_command (int): length of the longest rendered command
+        """
+        self.counts: Dict[str, int] = {}
+        self.errors: List[PlanError] = []
+        self.conflicts: Dict[OutputKey, List[Tuple[str, int]]] = {}
+        self.longest_command = 0
+
+    @property
+    def ok(self) -> bool:
+        """True if no call has an error or a conflicting output"""
+        return not self.errors and not self.conflicts
+
+    def __repr__(self) -> str:
+        return str({slot: getattr(self, slot) for slot in self.__slots__})
+
+    def __str__(self) -> str:
+        lines = [
+            f"PLAN: {sum(self.counts.values())} calls, {len(self.errors)} errors,"
+            f" {len(self.conflicts)} conflicts, longest command {self.longest_command} chars"
+        ]
+
+        errors_per_tool: Dict[str, int] = {}
+        for error in self.errors:
+            errors_per_tool[error.tool] = errors_per_tool.get(error.tool, 0) + 1
+
+        lines.extend(
+            f"  {tool}: {count} calls, {errors_per_tool.get(tool, 0)} errors"
+            for tool, count in self.counts.items()
+        )
+
+        if self.errors:
+            lines.append("ERRORS:")
+            lines.extend(
+                f"  {error.tool} #{error.index}: {error.error}"
+                for error in self.errors[: self.MAX_LISTED]
+            )
+
+        if self.conflicts:
+            lines.append("CONFLICTS:")
+            lines.extend(
+                f"  {_describe(output)}: {', '.join(f'{tool} #{index}' for tool, index in calls)}"
+                for output, calls in list(self.conflicts.items())[: self.MAX_LISTED]
+            )
+
+        return "\n".join(lines)
+
+
+def _describe(output: OutputKey) -> str:
+    """Output path, or `store:<name>` for an output kept in an OutputStore"""
+    return output if isinstance(output, str) else ":".join(output)
+
+
+def _plan_chunk(
+    app, calls: List[Tuple[int, Dict[str, Any]]], max_command_length: int
+) -> List[_PlannedCall]:
+    """Render a chunk of calls to the same tool
+
+    Args:
+        app (CWLApp): Tool to call
+        calls (List[Tuple[int, Dict[str, Any]]]): (index, kwargs) of each call
+        max_command_length (int): Longest command line allowed
+
+    Returns:
+        List[_PlannedCall]: (index, error or None, outputs, command length) of each call
+    """
+    planned = []
+    for index, kwargs in calls:
+        try:
+            args = app.plan(**kwargs)
+
+        except Exception as e:  # pylint: disable=broad-except
+            planned.append((index, f"{type(e).__name__}: {e}", [], 0))
+            continue
+
+        # `a.txt` and `/cwd/a.txt` are the same file
+        outputs: List[OutputKey] = [os.path.abspath(os.fspath(f.filepath)) for f in args["outputs"]]
+        outputs.extend(
+            os.path.abspath(os.fspath(args[stream]))
+            for stream in ("stdout", "stderr")
+            if args.get(stream) is not None
+        )
+        # stdout/stderr kept in an OutputStore are looked up by name
+        outputs.extend(("store", name) for _, name in args.get("streams", {}).values())
+
+        error = None
+        if len(args["command"]) > max_command_length:
+            error = f"command line too long: {len(args['command'])} > {max_command_length} chars"
+
+        planned.append((index, error, list(dict.fromkeys(outputs)), len(args["command"])))
+
+    return planned
+
+
+def _chunks(
+    calls: Iterable[Tuple[Any, Dict[str, Any]]], chunk_size: int
+) -> Iterator[Tuple[Any, List[Tuple[int, Dict[str, Any]]]]]:
+    """Group consecutive calls to the same tool into chunks"""
+    app = None
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    for index, (call_app, kwargs) in enumerate(calls):
+        if chunk and (call_app is not app or len(chunk) == chunk_size):
+            yield app, chunk
+            chunk = []
+
+        app = call_app
+        chunk.append((index, kwargs))
+
+    if chunk:
+        yield app, chunk
+
+
+def plan_calls(
+    calls: Iterable[Tuple[Any, Dict[str, Any]]],
+    processes: Optional[int] = None,
+    max_command_length: int = MAX_COMMAND_LENGTH,
+    chunk_size: int = CHUNK_SIZE,
+) -> PlanReport:
+    """Dry run a batch of CWLApp calls
+
+    Does all argument processing and command rendering of every call, without
+    submitting anything, and reports missing arguments, File type errors, over-long
+    command lines and output paths written by more than one call. Tools are reported
+    by the absolute path of their CWL file.
+
+    Args:
+        calls (Iterable[Tuple[CWLApp, Dict[str, Any]]]): (app, kwargs) of each call
+        processes (Optional[int]): Render in this many processes. Apps and kwargs must be
+            picklable (no futures of earlier calls). Renders in this process if None.
+        max_command_length (int): Longest command line allowed
+        chunk_size (int): Calls sent to a process at a time
+
+    Returns:
+        PlanReport: calls per tool, errors and conflicts
+    """
+    chunks = _chunks(calls, chunk_size)
+
+    if processes is None:
+        results = ((app, _plan_chunk(app, chunk, max_command_length)) for app, chunk in chunks)
+        return _report(results)
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        apps = []
+        futures = []
+        for app, chunk in chunks:
+            apps.append(app)
+            futures.append(pool.submit(_plan_chunk, app, chunk, max_command_length))
+
+        return _report((app, future.result()) for app, future in zip(apps, futures))
+
+
+def _report(results: Iterable[Tuple[Any, List[_PlannedCall]]]) -> PlanReport:
+    """Collect planned chunks into a report"""
+    report = PlanReport()
+    writers: Dict[OutputKey, Tuple[str, int]] = {}
+
+    for app, planned in results:
+        tool = app.cwl_file
+        report.counts[tool] = report.counts.get(tool, 0) + len(planned)
+
+        for index, error, outputs, command_length in planned:
+            if error is not None:
+                report.errors.append(PlanError(tool, index, error))
+
+            report.longest_command = max(report.longest_command, command_length)
+
+            for output in outputs:
+                if output not in writers:
+                    writers[output] = (tool, index)
+
+                elif output in report.conflicts:
+                    report.conflicts[output].append((tool, index))
+
+                else:
+                    report.conflicts[output] = [writers[output], (tool, index)]
+
+    return report
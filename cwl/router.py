@@ -0,0 +1,88 @@
+"""Choose the Parsl executors a CWLApp call is submitted to"""
+
+import os
+from typing import Dict, List, Literal, Optional, Union
+
+Executors = Union[List[str], Literal["all"]]
+
+
+class ExecutorRouter:
+    """Registry of Parsl executor labels for tools
+
+    The executors of a call are, in order of precedence:
+        1. the executor passed to the call
+        2. the label registered for the tool here, by path, else by file name
+        3. the label in the tool's `ParslExecutor` hint
+        4. fast_executor, if the tool's hinted cost is below cost_threshold
+        5. the default label of this router
+        6. all executors of the loaded Parsl config
+    """
+
+    def __init__(
+        self,
+        default: Optional[str] = None,
+        tools: Optional[Dict[str, str]] = None,
+        fast_executor: Optional[str] = None,
+        cost_threshold: Optional[float] = None,
+    ) -> None:
+        """Registry of Parsl executor labels for tools
+
+        Args:
+            default (Optional[str]): Label for tools without a more specific rule
+            tools (Optional[Dict[str, str]]): CWL file path or file name -> label
+            fast_executor (Optional[str]): Label of a low-latency executor (e.g. a
+                ThreadPoolExecutor) for cheap tools
+            cost_threshold (Optional[float]): Tools whose `ParslExecutor` hint has a cost
+                below this go to fast_executor
+        """
+        if (fast_executor is None) != (cost_threshold is None):
+            raise ValueError("fast_executor and cost_threshold must be given together")
+
+        self.default = default
+        self.tools: Dict[str, str] = {}
+        for tool, label in (tools or {}).items():
+            self.register(tool, label)
+        self.fast_executor = fast_executor
+        self.cost_threshold = cost_threshold
+
+    def register(self, tool: str, label: str) -> None:
+        """Send every call of a tool to an executor
+
+        Args:
+            tool (str): CWL file of the tool. A path (e.g. `tools/wc.cwl`) matches that
+                file only, a bare file name (`wc.cwl`) every file with that name.
+            label (str): Parsl executor label
+        """
+        if os.path.basename(tool) != tool:
+            tool = os.path.abspath(tool)
+
+        self.tools[tool] = label
+
+    def route(
+        self,
+        tool: str,
+        hint_label: Optional[str] = None,
+        hint_cost: Optional[float] = None,
+        executor: Optional[str] = None,
+    ) -> Executors:
+        """Executors for a call
+
+        Args:
+            tool (str): Absolute path of the tool's CWL file, or its file name
+            hint_label (Optional[str]): Label from the tool's `ParslExecutor` hint
+            hint_cost (Optional[float]): Cost from the tool's `ParslExecutor` hint
+            executor (Optional[str]): Label passed to the call
+
+        Returns:
+            Executors: executor labels, or "all"
+        """
+        label = (
+            executor or self.tools.get(tool) or self.tools.get(os.path.basename(tool)) or hint_label
+        )
+
+        if label is None and hint_cost is not None and self.cost_threshold is not None:
+            if hint_cost < self.cost_threshold:
+                label = self.fast_executor
+
+        label = label or self.default
+        return "all" if label is None else [label]
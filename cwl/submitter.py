@@ -0,0 +1,155 @@
+"""Submit CWLApp calls from background threads
+
+A CWLApp call does type checking, output validation, File list construction and
+command rendering on the caller's thread before Parsl takes over. AsyncSubmitter
+returns a placeholder future at once and does that work, and the submission, on a
+pool of threads, so a driver generating many calls keeps going while earlier calls
+are processed.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+_SHUTDOWN = None
+
+
+class PendingCall(Future):
+    """Placeholder future of a call, resolved with the result of the Parsl AppFuture
+
+    It can be waited on, and passed to other Parsl apps as a dependency, like the
+    AppFuture it stands for.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__submitted = threading.Event()
+        self.__app_future: Optional[Future] = None
+
+    def _set_app_future(self, app_future: Future) -> None:
+        """Link the AppFuture of the submitted call"""
+        self.__app_future = app_future
+        self.__submitted.set()
+        app_future.add_done_callback(self.__copy_result)
+
+    def _set_submit_exception(self, exception: BaseException) -> None:
+        """Fail the call, it could not be submitted"""
+        self.__submitted.set()
+        self.set_exception(exception)
+
+    def __copy_result(self, app_future: Future) -> None:
+        if app_future.exception() is not None:
+            self.set_exception(app_future.exception())
+        else:
+            self.set_result(app_future.result())
+
+    @property
+    def app_future(self) -> Optional[Future]:
+        """AppFuture of the call, waiting for it to be submitted
+
+        Returns:
+            Optional[Future]: the AppFuture, None if the call could not be submitted
+        """
+        self.__submitted.wait()
+        return self.__app_future
+
+    @property
+    def outputs(self) -> List[Any]:
+        """DataFutures of the output Files, waiting for the call to be submitted
+
+        Raises:
+            Exception: the error that prevented the call from being submitted
+        """
+        if self.app_future is None:
+            raise self.exception()
+
+        return self.app_future.outputs
+
+
+class AsyncSubmitter:
+    """Pool of threads that process and submit CWLApp calls"""
+
+    def __init__(self, workers: int = 1, max_pending: int = 10000) -> None:
+        """Pool of threads that process and submit CWLApp calls
+
+        Args:
+            workers (int): Number of submitting threads. Argument processing holds the
+                GIL, so more than a few rarely helps.
+            max_pending (int): Calls waiting to be processed before submit blocks
+                the caller (backpressure)
+        """
+        self.__queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.__threads = [
+            threading.Thread(target=self.__worker, name=f"cwl-submit-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        self.__shutdown = False
+        # a call is never queued behind the shutdown markers
+        self.__shutdown_lock = threading.Lock()
+
+        for thread in self.__threads:
+            thread.start()
+
+    def __enter__(self) -> "AsyncSubmitter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def submit(self, app: Callable[..., Future], /, **kwargs: Any) -> PendingCall:
+        """Queue a call, blocking while max_pending calls are already queued
+
+        Args:
+            app (Callable[..., Future]): CWLApp to call. Positional only, so a tool can
+                have an input called `app`.
+            kwargs: values for inputs and outputs mentioned in the CWL file
+
+        Returns:
+            PendingCall: placeholder future of the call
+        """
+        pending = PendingCall()
+        with self.__shutdown_lock:
+            if self.__shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+
+            self.__queue.put((pending, app, kwargs))
+
+        return pending
+
+    def __worker(self) -> None:
+        while True:
+            item = self.__queue.get()
+            if item is _SHUTDOWN:
+                return
+
+            pending, app, kwargs = item
+            if not pending.set_running_or_notify_cancel():
+                continue
+
+            try:
+                app_future = app(**kwargs)
+
+            except Exception as e:  # pylint: disable=broad-except
+                pending._set_submit_exception(e)
+
+            else:
+                pending._set_app_future(app_future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting calls and let the threads finish the queued ones
+
+        Args:
+            wait (bool): Wait until every queued call is submitted
+        """
+        with self.__shutdown_lock:
+            if self.__shutdown:
+                return
+
+            self.__shutdown = True
+            for _ in self.__threads:
+                self.__queue.put(_SHUTDOWN)
+
+        if wait:
+            for thread in self.__threads:
+                thread.join()
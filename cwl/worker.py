@@ -0,0 +1,163 @@
+"""Worker-side helpers to run a rendered command"""
+
+import os
+import subprocess
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+from cwl.checksums import file_checksums
+from cwl.output_store import OutputHandle, OutputStore
+
+
+def _open_std_stream(path: Optional[str]) -> Optional[IO]:
+    """Open a stdout/stderr file the same way Parsl's bash_app does (append mode)
+
+    Args:
+        path (Optional[str]): Path of the file, or None to inherit the stream
+    """
+    if path is None:
+        return None
+
+    path = os.fspath(path)
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    return open(path, "a+", encoding="utf-8")
+
+
+def run_command(
+    command: str,
+    stdout: Optional[str] = None,
+    stderr: Optional[str] = None,
+    stdin: Optional[str] = None,
+) -> int:
+    """Run a shell command, redirecting stdout/stderr to files if given
+
+    Args:
+        command (str): Shell command to run
+        stdout (Optional[str]): File to append the command's stdout to
+        stderr (Optional[str]): File to append the command's stderr to
+        stdin (Optional[str]): File streamed into the command's stdin
+
+    Returns:
+        int: exit code of the command
+    """
+    out = _open_std_stream(stdout)
+    err = out if stderr is not None and stderr == stdout else _open_std_stream(stderr)
+    inp = open(stdin, "rb") if stdin is not None else None
+
+    try:
+        return subprocess.run(
+            command, shell=True, stdout=out, stderr=err, stdin=inp, check=False
+        ).returncode
+
+    finally:
+        for stream in {out, err, inp}:
+            if stream is not None:
+                stream.close()
+
+
+def run_command_to_store(
+    command: str,
+    store: OutputStore,
+    streams: Dict[str, Tuple[str, str]],
+    checksum: Optional[str] = None,
+    checksum_paths: Optional[Dict[str, Union[str, List[str]]]] = None,
+    stdin: Optional[str] = None,
+    inputs: Optional[List[Any]] = None,
+    outputs: Optional[List[Any]] = None,
+) -> Dict[str, Union[OutputHandle, str, List[str]]]:
+    """Run a shell command on a Parsl worker, keeping its stdout/stderr in an OutputStore
+
+    Args:
+        command (str): Shell command to run
+        store (OutputStore): Store to append stdout/stderr to
+        streams (Dict[str, Tuple[str, str]]): output id -> (stdout or stderr, stored name)
+        checksum (Optional[str]): hashlib algorithm to checksum the outputs with
+        checksum_paths (Optional[Dict[str, Union[str, List[str]]]]): output id -> path(s)
+            of the output files to checksum
+        stdin (Optional[str]): File streamed into the command's stdin
+        inputs (Optional[List[Any]]): Input files, for Parsl to track dependencies
+        outputs (Optional[List[Any]]): Output files, for Parsl to track dependencies
+
+    Raises:
+        parsl.app.errors.BashExitFailure: if the command exits with a non-zero code
+
+    Returns:
+        Dict[str, Union[OutputHandle, str, List[str]]]: output id -> stored output, and
+            output id -> hex digest(s) for checksummed output files
+    """
+    exit_code, handles = store.run(command, streams, checksum, stdin)
+    if exit_code != 0:
+        from parsl.app.errors import BashExitFailure
+
+        raise BashExitFailure(command, exit_code)
+
+    if checksum is not None and checksum_paths:
+        return {**handles, **output_checksums(checksum_paths, checksum)}
+
+    return handles
+
+
+def output_checksums(
+    checksum_paths: Dict[str, Union[str, List[str]]], algorithm: str
+) -> Dict[str, Union[str, List[str]]]:
+    """Checksums of output files, all hashed in parallel
+
+    Args:
+        checksum_paths (Dict[str, Union[str, List[str]]]): output id -> path(s) of the output
+        algorithm (str): Any algorithm supported by hashlib
+
+    Returns:
+        Dict[str, Union[str, List[str]]]: output id -> hex digest(s), in the shape of checksum_paths
+    """
+    digests = file_checksums(
+        [path for paths in checksum_paths.values() for path in _as_list(paths)], algorithm
+    )
+
+    return {
+        arg_id: [digests[path] for path in paths] if isinstance(paths, list) else digests[paths]
+        for arg_id, paths in checksum_paths.items()
+    }
+
+
+def _as_list(value: Union[str, List[str]]) -> List[str]:
+    return value if isinstance(value, list) else [value]
+
+
+def run_command_with_checksums(
+    command: str,
+    checksum: str,
+    checksum_paths: Dict[str, Union[str, List[str]]],
+    stdout: Optional[str] = None,
+    stderr: Optional[str] = None,
+    stdin: Optional[str] = None,
+    inputs: Optional[List[Any]] = None,
+    outputs: Optional[List[Any]] = None,
+) -> Dict[str, Union[str, List[str]]]:
+    """Run a shell command on a Parsl worker and checksum its outputs right after
+
+    Args:
+        command (str): Shell command to run
+        checksum (str): hashlib algorithm to checksum the outputs with
+        checksum_paths (Dict[str, Union[str, List[str]]]): output id -> path(s) of the
+            output files and stdout/stderr to checksum
+        stdout (Optional[str]): File to append the command's stdout to
+        stderr (Optional[str]): File to append the command's stderr to
+        stdin (Optional[str]): File streamed into the command's stdin
+        inputs (Optional[List[Any]]): Input files, for Parsl to track dependencies
+        outputs (Optional[List[Any]]): Output files, for Parsl to track dependencies
+
+    Raises:
+        parsl.app.errors.BashExitFailure: if the command exits with a non-zero code
+
+    Returns:
+        Dict[str, Union[str, List[str]]]: output id -> hex digest(s)
+    """
+    exit_code = run_command(command, stdout=stdout, stderr=stderr, stdin=stdin)
+    if exit_code != 0:
+        from parsl.app.errors import BashExitFailure
+
+        raise BashExitFailure(command, exit_code)
+
+    return output_checksums(checksum_paths, checksum)
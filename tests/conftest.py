@@ -0,0 +1,16 @@
+"""Shared fixtures for the tests"""
+
+import parsl
+import pytest
+from parsl.configs.local_threads import config
+from parsl.errors import NoDataFlowKernelError
+
+
+@pytest.fixture(scope="session")
+def parsl_dfk():
+    """Parsl DataFlowKernel with the local threads config, loaded once for all tests"""
+    try:
+        return parsl.dfk()
+
+    except NoDataFlowKernelError:
+        return parsl.load(config)
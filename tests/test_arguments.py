@@ -0,0 +1,64 @@
+"""Tests for CWL arguments and stdin"""
+
+import os
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import CWLApp
+from cwl.cwl_app import ArgumentMissing
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def write_lines(path) -> File:
+    """Write an unsorted file with a duplicate line"""
+    path.write_text("b\nc\na\nc\n", encoding="utf-8")
+    return File(str(path))
+
+
+def test_render_plan(tmp_path) -> None:
+    """Test arguments are merged with inputs by position and stdin is bound."""
+    sort = CWLApp(os.path.join(test_cwl_files, "sort.cwl"))
+
+    args = sort.plan(input_file=File("/data/lines.txt"), outdir=str(tmp_path), unique=True)
+
+    assert args["command"] == "sort -r -k 1 -u"
+    assert args["stdin"] == "/data/lines.txt"
+    assert args["stdout"] == str(tmp_path / "lines.sorted")
+    assert args["inputs"][0].filepath == "/data/lines.txt"
+    assert sort.command_template == "COMMAND TEMPLATE:\nsort -r -k $(inputs.key) [-u]"
+
+    with pytest.raises(ArgumentMissing):
+        sort.plan(input_file=File("/data/lines.txt"))
+
+
+def test_default_positions() -> None:
+    """Test a missing position is 0 for inputs and arguments, arguments first on ties."""
+    echo = CWLApp(os.path.join(test_cwl_files, "echo_positions.cwl"))
+
+    assert echo.get_command(x="X", a="A") == "echo ARG0 -a A -x X ARG1"
+
+
+def test_falsy_defaults() -> None:
+    """Test inputs defaulting to 0 or false are not missing and render their default."""
+    echo = CWLApp(os.path.join(test_cwl_files, "echo_default.cwl"))
+
+    assert echo.plan()["command"] == "echo 0"
+    assert echo.plan(count=3)["command"] == "echo 3"
+
+
+def test_stdin(tmp_path) -> None:
+    """Test a File input is streamed into the command with Parsl and the local runner."""
+    sort = CWLApp(os.path.join(test_cwl_files, "sort.cwl"))
+    input_file = write_lines(tmp_path / "lines.txt")
+
+    sort(input_file=input_file, outdir=str(tmp_path / "parsl"), unique=True).result()
+    with open(tmp_path / "parsl" / "lines.sorted", "r", encoding="utf-8") as f:
+        assert f.read() == "c\nb\na\n"
+
+    assert sort.run_local(input_file=input_file, outdir=str(tmp_path / "local")) == 0
+    with open(tmp_path / "local" / "lines.sorted", "r", encoding="utf-8") as f:
+        assert f.read() == "c\nc\nb\na\n"
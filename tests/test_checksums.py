@@ -0,0 +1,112 @@
+"""Tests for worker-side checksums of tool outputs"""
+
+import hashlib
+import os
+import time
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import CWLApp, OutputStore
+from cwl import checksums
+from cwl.checksums import file_checksum
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def sha256(path: str) -> str:
+    """Checksum of a whole file, read at once"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_manifest(manifest: str, lines: int, timeout: float = 10) -> dict:
+    """Manifest entries, once it has the expected number of lines
+
+    The manifest is appended by a callback that can run just after the future resolves.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if os.path.exists(manifest):
+            with open(manifest, "r", encoding="utf-8") as f:
+                entries = [line.split("  ", 1) for line in f.read().splitlines()]
+
+            if len(entries) >= lines:
+                return {path: digest for digest, path in entries}
+
+        time.sleep(0.05)
+
+    raise TimeoutError(manifest)
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_file_checksum_chunks(tmp_path, monkeypatch, prefetch) -> None:
+    """Test chunked hashing of whole files and byte ranges, read inline and prefetched."""
+    if prefetch:
+        monkeypatch.setattr(checksums, "PREFETCH_SIZE", 1024)
+
+    path = tmp_path / "data.bin"
+    data = os.urandom(3 * 1024 * 1024 + 7)
+    path.write_bytes(data)
+
+    assert file_checksum(str(path), chunk_size=4096) == hashlib.sha256(data).hexdigest()
+    assert file_checksum(str(path), "md5", 10, 100000) == hashlib.md5(data[10:100010]).hexdigest()
+
+
+def test_prefetch_read_error(tmp_path, monkeypatch) -> None:
+    """Test a read error in the prefetch thread is raised by the checksum."""
+
+    def failing_chunks(f, length, chunk_size):
+        yield f.read(chunk_size)
+        raise OSError("read failed")
+
+    monkeypatch.setattr(checksums, "PREFETCH_SIZE", 0)
+    monkeypatch.setattr(checksums, "_read_chunks", failing_chunks)
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 10000)
+
+    with pytest.raises(OSError, match="read failed"):
+        file_checksum(str(path), chunk_size=1000)
+
+
+def test_output_checksums(tmp_path) -> None:
+    """Test checksums of output files and stdout come back with the future."""
+    manifest = str(tmp_path / "manifest.sha256")
+    touch = CWLApp(os.path.join(test_cwl_files, "touch.cwl"), manifest=manifest)
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc.cwl"), checksum="sha256")
+
+    filenames = [str(tmp_path / "touch1.txt"), str(tmp_path / "touch2.txt")]
+    touched = touch(filenames=filenames, output_files=[File(name) for name in filenames])
+    assert touched.result() == {"output_files": [hashlib.sha256(b"").hexdigest()] * 2}
+
+    stdout = str(tmp_path / "wc_stdout.txt")
+    counted = word_count(text_file=File(os.path.join(test_cwl_files, "wc.cwl")), stdout=stdout)
+    assert counted.result() == {"stdout": sha256(stdout)}
+
+    assert read_manifest(manifest, 2) == {
+        name: hashlib.sha256(b"").hexdigest() for name in filenames
+    }
+
+
+def test_stored_output_checksums(tmp_path) -> None:
+    """Test stored stdout is checksummed from its segment."""
+    manifest = str(tmp_path / "manifest.md5")
+    store = OutputStore(str(tmp_path / "store"))
+    word_count = CWLApp(
+        os.path.join(test_cwl_files, "wc.cwl"),
+        output_store=store,
+        checksum="md5",
+        manifest=manifest,
+    )
+
+    handle = word_count(
+        text_file=File(os.path.join(test_cwl_files, "wc.cwl")), stdout="wc"
+    ).result()["stdout"]
+
+    assert handle.checksum == hashlib.md5(handle.read()).hexdigest()
+    assert store.get("wc").checksum == handle.checksum
+    assert read_manifest(manifest + CWLApp.STORED_MANIFEST_SUFFIX, 1) == {"wc": handle.checksum}
+    assert not os.path.exists(manifest)
@@ -0,0 +1,82 @@
+"""Tests for the `python -m cwl` command line runner"""
+
+import os
+
+from cwl.__main__ import _parsl_config, job_names, main
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def write_job(path, text_file: str) -> str:
+    """Write a wc job file for text_file"""
+    path.write_text(f"text_file:\n  class: File\n  path: {text_file}\n", encoding="utf-8")
+    return str(path)
+
+
+def test_run_local(tmp_path) -> None:
+    """Test running several job files in parallel with the local runner."""
+    wc_cwl = os.path.join(test_cwl_files, "wc.cwl")
+    jobs = [write_job(tmp_path / f"job{i}.yml", wc_cwl) for i in range(3)]
+    outdir = tmp_path / "out"
+
+    assert main(["run", "-e", "local", "-j", "2", "-o", str(outdir), wc_cwl, *jobs]) == 0
+
+    for i in range(3):
+        with open(outdir / f"job{i}.stdout", "r", encoding="utf-8") as f:
+            assert f.read().split()[:3] == ["12", "19", "170"]
+
+
+def test_run_local_failure(tmp_path, capsys) -> None:
+    """Test a failing job is reported and sets the exit status."""
+    wc_cwl = os.path.join(test_cwl_files, "wc.cwl")
+    job = write_job(tmp_path / "missing.yml", str(tmp_path / "does_not_exist.txt"))
+
+    assert main(["run", "-o", str(tmp_path), wc_cwl, job]) == 1
+    assert "FAILED: exit code" in capsys.readouterr().out
+
+
+def test_run_same_job_names(tmp_path, capsys) -> None:
+    """Test job files with the same name, or given twice, write separate outputs."""
+    wc_cwl = os.path.join(test_cwl_files, "wc.cwl")
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    job_a = write_job(tmp_path / "a" / "job.yml", wc_cwl)
+    job_b = write_job(tmp_path / "b" / "job.yml", wc_cwl)
+    outdir = tmp_path / "out"
+
+    assert job_names([job_a, job_b, job_a]) == ["a/job.0", "b/job", "a/job.2"]
+    assert main(["run", "-o", str(outdir), wc_cwl, job_a, job_b, job_a]) == 0
+    assert capsys.readouterr().out.count(": ok") == 3
+
+    for name in ("a/job.0", "b/job", "a/job.2"):
+        with open(outdir / f"{name}.stdout", "r", encoding="utf-8") as f:
+            assert f.read().split()[:3] == ["12", "19", "170"]
+
+
+def test_validate_falsy_defaults(tmp_path, capsys) -> None:
+    """Test inputs defaulting to 0 or false are not reported as missing."""
+    job = tmp_path / "job.yml"
+    job.write_text("{}\n", encoding="utf-8")
+
+    assert main(["validate", os.path.join(test_cwl_files, "echo_default.cwl"), str(job)]) == 0
+    assert f"{job}: ok" in capsys.readouterr().out
+
+
+def test_parsl_run_dir(tmp_path) -> None:
+    """Test Parsl configs never default to runinfo/ in the current directory."""
+    for executor in ("threads", "htex"):
+        assert _parsl_config(executor, 1, str(tmp_path)).run_dir == str(tmp_path)
+        assert os.path.abspath(_parsl_config(executor, 1).run_dir) != os.path.abspath("runinfo")
+
+
+def test_validate(tmp_path, capsys) -> None:
+    """Test validating job files against a tool."""
+    find_cwl = os.path.join(test_cwl_files, "find.cwl")
+    good = tmp_path / "good.yml"
+    good.write_text("dir: .\n", encoding="utf-8")
+    bad = tmp_path / "bad.yml"
+    bad.write_text("name: '*.cwl'\n", encoding="utf-8")
+
+    assert main(["validate", find_cwl, str(good)]) == 0
+    assert main(["validate", find_cwl, str(bad)]) == 1
+    assert "missing required value for argument(s): dir" in capsys.readouterr().out
@@ -0,0 +1,103 @@
+"""Tests for CWL parameter references"""
+
+import os
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import CWLApp
+from cwl.cwl_app import ArgumentMissing
+from cwl.expressions import InvalidExpression, compile_expression
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def test_evaluate() -> None:
+    """Test references to inputs, items, fields and File properties."""
+    inputs = {"sample": "s1", "files": [File("/data/a.fastq.gz")], "meta": {"run id": 7}}
+
+    assert compile_expression("$(inputs.sample).txt").evaluate(inputs) == "s1.txt"
+    assert compile_expression("$(inputs.files)").evaluate(inputs) is inputs["files"]
+    assert compile_expression("$(inputs.files[0].basename)").evaluate(inputs) == "a.fastq.gz"
+    assert compile_expression("$(inputs.files[0].nameroot)").evaluate(inputs) == "a.fastq"
+    assert compile_expression("$(inputs.files[0])").evaluate(inputs).filepath == "/data/a.fastq.gz"
+    assert compile_expression("$(inputs.files.length)").evaluate(inputs) == 1
+    assert compile_expression("$(inputs.meta['run id'])-$(self)").evaluate(inputs, 3) == "7-3"
+    assert compile_expression("\\$(inputs.sample)").evaluate(inputs) == "$(inputs.sample)"
+    assert compile_expression("plain.txt").is_constant
+
+
+@pytest.mark.parametrize(
+    "source", ["${ return 1; }", "$(inputs.x + 1)", "$(runtime.outdir)", "$(inputs.x"]
+)
+def test_unsupported(source) -> None:
+    """Test JavaScript and malformed references are rejected when compiled."""
+    with pytest.raises(InvalidExpression):
+        compile_expression(source)
+
+
+def test_missing_values() -> None:
+    """Test references to left out optional inputs are never interpolated as None."""
+    inputs = {"tag": None, "files": None}
+
+    assert compile_expression("$(inputs.tag)").evaluate(inputs) is None
+    assert compile_expression("$(inputs.files[0].basename)").evaluate(inputs) is None
+
+    with pytest.raises(ArgumentMissing, match="tag"):
+        compile_expression("$(inputs.tag)").evaluate(inputs, required=True)
+
+    with pytest.raises(ArgumentMissing, match="files"):
+        compile_expression("$(inputs.files[0].basename).log").evaluate(inputs)
+
+    echo = CWLApp(os.path.join(test_cwl_files, "echo_tag.cwl"))
+    assert echo.plan(msg="hi", tag="t1")["stdout"] == "t1.log"
+    assert echo.plan(msg="hi", tag="t1")["command"] == "echo hi --tag t1"
+
+    with pytest.raises(ArgumentMissing, match="tag"):
+        echo.plan(msg="hi")
+
+    # stdout named by the call, the left out input is left out of the command
+    assert echo.plan(msg="hi", out="hi.log")["command"] == "echo hi"
+
+
+def test_glob_outputs(tmp_path) -> None:
+    """Test output Files are taken from outputBinding.glob when left out of the call."""
+    touch = CWLApp(os.path.join(test_cwl_files, "touch.cwl"))
+    filenames = [str(tmp_path / "touch1.txt"), str(tmp_path / "touch2.txt")]
+
+    future = touch(filenames=filenames)
+    future.result()
+
+    assert [output.filepath for output in future.outputs] == filenames
+    assert all(os.path.exists(filename) for filename in filenames)
+
+
+def test_stdout_and_value_from(tmp_path) -> None:
+    """Test the stdout filename and valueFrom are rendered from the call's inputs."""
+    echo = CWLApp(os.path.join(test_cwl_files, "echo_sample.cwl"))
+    sample = str(tmp_path / "sample_1")
+
+    args = echo.plan(sample=sample, reference=File("/data/ref.fa"))
+    assert args["command"] == f"echo {sample} ref.fa"
+    assert args["stdout"] == f"{sample}.txt"
+
+    echo(sample=sample, reference=File("/data/ref.fa")).result()
+    with open(f"{sample}.txt", "r", encoding="utf-8") as f:
+        assert f.read() == f"{sample} ref.fa\n"
+
+
+def test_wildcard_glob_missing() -> None:
+    """Test outputs with a wildcard glob are reported missing, as the call rejects them."""
+    touch = CWLApp(os.path.join(test_cwl_files, "touch_wildcard.cwl"))
+    named = CWLApp(os.path.join(test_cwl_files, "touch.cwl"))
+
+    assert touch.missing_arguments({"filenames": ["a.txt"]}) == ["out"]
+    assert named.missing_arguments({"filenames": ["a.txt"]}) == []
+    assert named.missing_arguments({}) == ["filenames"]
+
+    with pytest.raises(ArgumentMissing, match="out"):
+        touch.plan(filenames=["a.txt"])
+
+    assert touch.plan(filenames=["a.txt"], out=[File("a.txt")])["command"] == "touch a.txt"
@@ -0,0 +1,52 @@
+"""Tests for packed CWL documents with a $graph of tools"""
+
+import os
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import CWLApp, CWLGraph
+from cwl.cwl_app import InvalidCWL
+from cwl.graph import load_document
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+packed_cwl = os.path.join(test_cwl_files, "packed.cwl")
+
+
+def test_graph_tools(tmp_path) -> None:
+    """Test tools of a packed document are built on first use and run."""
+    graph = CWLGraph(packed_cwl)
+
+    assert graph.ids == ["main", "touch", "broken"]
+    assert "#touch" in graph
+
+    touch = graph["touch"]
+    assert graph["#touch"] is touch
+    assert touch.cwl_file_name == "packed.cwl#touch"
+    assert touch.cwl_version == "v1.0"
+
+    filenames = [str(tmp_path / "touch1.txt"), str(tmp_path / "touch2.txt")]
+    touch(filenames=filenames).result()
+    assert all(os.path.exists(filename) for filename in filenames)
+
+    # the invalid tool only fails when it is requested
+    with pytest.raises(InvalidCWL):
+        graph["broken"]  # pylint: disable=pointless-statement
+
+    with pytest.raises(KeyError):
+        graph["missing"]  # pylint: disable=pointless-statement
+
+
+def test_fragment(tmp_path) -> None:
+    """Test `packed.cwl#id` and a packed file without fragment (its main tool)."""
+    assert load_document(packed_cwl) is load_document(packed_cwl)
+
+    stdout = str(tmp_path / "wc_stdout.txt")
+    for word_count in (CWLApp(f"{packed_cwl}#main"), CWLApp(packed_cwl)):
+        args = word_count.plan(text_file=File("a.txt"), stdout=stdout)
+        assert args["command"] == "wc a.txt"
+
+    with pytest.raises(InvalidCWL):
+        CWLApp(f"{packed_cwl}#missing")
@@ -5,6 +5,7 @@ import os
 import pytest
 
 from cwl import CWLApp
+from cwl.cwl_app import InvalidCWL
 
 invalid_cwl_files = os.path.join(os.getcwd(), "tests", "invalid-cwl-files")
 
@@ -19,3 +20,21 @@ def test_invalid_dict_keys() -> None:
     """Test for the wc CWL CommandLineTool with invalid variable names as dict keys."""
     with pytest.raises(Exception):
         CWLApp(os.path.join(invalid_cwl_files, "touch_invalid.cwl"))
+
+
+def test_invalid_parameter_reference() -> None:
+    """Test for a parameter reference that needs a JavaScript engine."""
+    with pytest.raises(Exception):
+        CWLApp(os.path.join(invalid_cwl_files, "echo_js_invalid.cwl"))
+
+
+def test_invalid_executor_hint() -> None:
+    """Test for a ParslExecutor hint that is not a mapping."""
+    with pytest.raises(InvalidCWL):
+        CWLApp(os.path.join(invalid_cwl_files, "touch_hint_invalid.cwl"))
+
+
+def test_unknown_input_reference() -> None:
+    """Test for a parameter reference to an input the tool does not declare."""
+    with pytest.raises(InvalidCWL, match="smaple"):
+        CWLApp(os.path.join(invalid_cwl_files, "echo_reference_invalid.cwl"))
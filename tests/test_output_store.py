@@ -0,0 +1,89 @@
+"""Tests for keeping stdout/stderr in an OutputStore"""
+
+import os
+
+import pytest
+from parsl.app.errors import BashExitFailure
+from parsl.configs.local_threads import config
+from parsl.data_provider.files import File
+
+from cwl import CWLApp, OutputStore
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def test_stored_outputs(tmp_path) -> None:
+    """Test outputs of many calls share segment files and are found through the index."""
+    store = OutputStore(str(tmp_path / "store"))
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc.cwl"), output_store=store)
+
+    futures = [
+        word_count(text_file=File(os.path.join(test_cwl_files, "wc.cwl")), stdout=f"wc_{i}")
+        for i in range(20)
+    ]
+    handles = [future.result()["stdout"] for future in futures]
+
+    with open(os.path.join(test_cwl_files, "wc.cwl"), "rb") as f:
+        lines = f.read().count(b"\n")
+
+    for i, handle in enumerate(handles):
+        assert handle.name == f"wc_{i}"
+        assert int(handle.read_text().split()[0]) == lines
+        assert store.get(f"wc_{i}").read() == handle.read()
+
+    # one segment and one index file per worker thread, not one file per output
+    assert len(os.listdir(store.root)) <= 2 * config.executors[0].max_threads
+    assert len(list(store)) == 20
+
+
+def test_stored_outputs_unnamed(tmp_path) -> None:
+    """Test stdout/stderr arguments are optional with an output store."""
+    store = OutputStore(str(tmp_path / "store"))
+    find = CWLApp(os.path.join(test_cwl_files, "find.cwl"), output_store=store)
+
+    handle = find(dir=test_cwl_files, name="wc.cwl").result()["example_out"]
+
+    assert handle.read_text().strip() == os.path.join(test_cwl_files, "wc.cwl")
+
+
+def test_stored_outputs_failure(tmp_path) -> None:
+    """Test a failing command raises and still keeps its output."""
+    store = OutputStore(str(tmp_path / "store"))
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc.cwl"), output_store=store)
+
+    with pytest.raises(BashExitFailure):
+        word_count(text_file=File(str(tmp_path / "missing.txt")), stdout="missing").result()
+
+    assert store.get("missing") is not None
+
+
+def test_index_loaded_incrementally(tmp_path) -> None:
+    """Test lookups only read index records appended since the last load."""
+    store = OutputStore(str(tmp_path / "store"))
+    store.run("echo first", {"stdout": ("stdout", "first")})
+    assert store.get("missing") is None
+
+    index_file = next(
+        entry.path for entry in os.scandir(store.root) if entry.name.endswith(store.INDEX_SUFFIX)
+    )
+    # records already loaded are not read again, a half written record is not read yet
+    with open(index_file, "r+b") as f:
+        loaded = f.readline()
+        f.seek(0)
+        f.write(b"x" * (len(loaded) - 1))
+        f.seek(0, os.SEEK_END)
+        f.write(b'{"name": "partial"')
+
+    assert store.get("first").read_text() == "first\n"
+    assert store.get("partial") is None
+
+    with open(index_file, "a", encoding="utf-8") as f:
+        f.write(', "stream": "stdout", "path": "p", "offset": 0, "length": 0}\n')
+
+    store.run("echo second", {"stdout": ("stdout", "second")})
+    assert store.get("partial").path == "p"
+    assert store.get("second").read_text() == "second\n"
+    assert len(list(store)) == 3
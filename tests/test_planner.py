@@ -0,0 +1,90 @@
+"""Tests for dry runs of CWLApp calls"""
+
+import os
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import CWLApp, OutputStore, plan_calls
+from cwl.cwl_app import ArgumentMissing
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+find = CWLApp(os.path.join(test_cwl_files, "find.cwl"))
+touch = CWLApp(os.path.join(test_cwl_files, "touch.cwl"))
+word_count = CWLApp(os.path.join(test_cwl_files, "wc.cwl"))
+
+
+def campaign():
+    """Calls with one missing argument, one File type error and two conflicting outputs"""
+    calls = [(find, {"dir": f"dir_{i}", "example_out": f"find_{i}.txt"}) for i in range(50)]
+    calls.append((find, {"example_out": "find_missing.txt"}))
+    calls.append((word_count, {"text_file": "not_a_file.txt", "stdout": "wc_0.txt"}))
+    calls.append((word_count, {"text_file": File("a.txt"), "stdout": "find_3.txt"}))
+    calls.append((touch, {"filenames": ["t.txt"], "output_files": [File("./find_7.txt")]}))
+    return calls
+
+
+def test_plan_single_call() -> None:
+    """Test a single dry run renders the command and raises like a real call."""
+    args = find.plan(dir=".", name="*.cwl", example_out="out.txt")
+
+    assert args["command"] == "find . -name *.cwl -maxdepth 3"
+    assert args["stdout"] == "out.txt"
+
+    with pytest.raises(ArgumentMissing):
+        find.plan(example_out="out.txt")
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_plan_calls(processes) -> None:
+    """Test a batch dry run counts calls and reports errors and conflicts."""
+    report = plan_calls(campaign(), processes=processes, chunk_size=8)
+
+    assert not report.ok
+    assert report.counts == {find.cwl_file: 51, word_count.cwl_file: 2, touch.cwl_file: 1}
+    assert [(error.tool, error.index) for error in report.errors] == [
+        (find.cwl_file, 50),
+        (word_count.cwl_file, 51),
+    ]
+    assert "ArgumentMissing" in report.errors[0].error
+    assert "TypeError" in report.errors[1].error
+    assert report.conflicts == {
+        os.path.abspath("find_3.txt"): [(find.cwl_file, 3), (word_count.cwl_file, 52)],
+        os.path.abspath("find_7.txt"): [(find.cwl_file, 7), (touch.cwl_file, 53)],
+    }
+    assert "PLAN: 54 calls, 2 errors, 2 conflicts" in str(report)
+
+
+def test_plan_command_too_long() -> None:
+    """Test over-long command lines are reported."""
+    calls = [(touch, {"filenames": ["x" * 100] * 10, "output_files": []})]
+
+    assert plan_calls(calls).ok
+    report = plan_calls(calls, max_command_length=500)
+    assert "command line too long" in report.errors[0].error
+    assert report.longest_command > 1000
+
+
+def test_plan_output_identity(tmp_path) -> None:
+    """Test outputs are compared as absolute paths, store names apart from paths."""
+    store = OutputStore(str(tmp_path / "store"))
+    stored_find = CWLApp(os.path.join(test_cwl_files, "find.cwl"), output_store=store)
+    tools_find = CWLApp(os.path.join(os.getcwd(), "tools", "cwl_files", "find.cwl"))
+
+    report = plan_calls(
+        [
+            (touch, {"filenames": ["a.txt"]}),
+            (touch, {"filenames": [os.path.abspath("a.txt")]}),
+            (stored_find, {"dir": ".", "example_out": "out.txt"}),
+            (find, {"dir": ".", "example_out": "out.txt"}),
+            (tools_find, {"dir": ".", "to_file": "other.txt"}),
+        ]
+    )
+
+    assert report.conflicts == {
+        os.path.abspath("a.txt"): [(touch.cwl_file, 0), (touch.cwl_file, 1)]
+    }
+    assert report.counts[find.cwl_file] == 2
+    assert report.counts[tools_find.cwl_file] == 1
+    assert not report.errors
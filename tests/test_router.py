@@ -0,0 +1,85 @@
+"""Tests for routing CWLApp calls to Parsl executors"""
+
+import os
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import CWLApp, ExecutorRouter
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def test_route_precedence() -> None:
+    """Test call override > registered tool > hint label > cost rule > default."""
+    router = ExecutorRouter(
+        default="htex", tools={"wc.cwl": "big"}, fast_executor="threads", cost_threshold=1
+    )
+
+    assert router.route("wc.cwl", "hinted", 0.5, executor="override") == ["override"]
+    assert router.route("wc.cwl", "hinted", 0.5) == ["big"]
+    assert router.route("touch.cwl", "hinted", 0.5) == ["hinted"]
+    assert router.route("touch.cwl", None, 0.5) == ["threads"]
+    assert router.route("touch.cwl", None, 5) == ["htex"]
+    assert router.route("touch.cwl") == ["htex"]
+    assert ExecutorRouter().route("touch.cwl") == "all"
+
+
+def test_hints() -> None:
+    """Test executors are chosen from the ParslExecutor hint in map and list form."""
+    router = ExecutorRouter(default="htex", fast_executor="threads", cost_threshold=1)
+
+    touch = CWLApp(os.path.join(test_cwl_files, "touch_hints.cwl"), router=router)
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc_hints.cwl"), router=router)
+    find = CWLApp(os.path.join(test_cwl_files, "find.cwl"))
+
+    assert touch.get_executors() == ["threads"]
+    assert touch.get_executors("htex") == ["htex"]
+    assert word_count.get_executors() == ["threads"]
+    assert find.get_executors() == "all"
+
+
+def test_route_by_path() -> None:
+    """Test a tool registered by path does not route other files with the same name."""
+    tools_find = CWLApp(os.path.join(os.getcwd(), "tools", "cwl_files", "find.cwl"))
+    test_find = os.path.join(test_cwl_files, "find.cwl")
+
+    router = ExecutorRouter(default="htex", tools={os.path.relpath(test_find): "big"})
+    assert router.route(os.path.abspath(test_find)) == ["big"]
+    assert router.route(tools_find.cwl_file) == ["htex"]
+
+    router.register("find.cwl", "threads")
+    assert router.route(os.path.abspath(test_find)) == ["big"]
+    assert router.route(tools_find.cwl_file) == ["threads"]
+
+
+def test_route_after_chdir(tmp_path, monkeypatch) -> None:
+    """Test a tool built from a relative path keeps its route when the driver changes directory."""
+    touch = CWLApp(os.path.relpath(os.path.join(test_cwl_files, "touch.cwl")))
+    touch_file = touch.cwl_file
+    router = ExecutorRouter(tools={touch_file: "threads"})
+
+    monkeypatch.chdir(tmp_path)
+    assert touch.cwl_file == touch_file
+    assert router.route(touch.cwl_file) == ["threads"]
+
+
+def test_routed_call(tmp_path) -> None:
+    """Test calls run on the routed executor and fail on an unknown one."""
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc_hints.cwl"))
+    stdout = str(tmp_path / "wc_stdout.txt")
+
+    assert (
+        word_count(text_file=File(os.path.join(test_cwl_files, "wc.cwl")), stdout=stdout).result()
+        == 0
+    )
+    assert os.path.getsize(stdout) > 0
+
+    with pytest.raises(KeyError):
+        word_count(
+            text_file=File(os.path.join(test_cwl_files, "wc.cwl")),
+            stdout=stdout,
+            parsl_executor="no_such_executor",
+        ).result()
@@ -0,0 +1,141 @@
+"""Tests for submitting CWLApp calls from background threads"""
+
+import os
+import threading
+from concurrent.futures import Future
+
+import pytest
+from parsl.data_provider.files import File
+
+from cwl import AsyncSubmitter, CWLApp
+from cwl.cwl_app import ArgumentMissing
+
+pytestmark = pytest.mark.usefixtures("parsl_dfk")
+
+test_cwl_files = os.path.join(os.getcwd(), "tests", "test-cwl-files")
+
+
+def test_submit_many(tmp_path) -> None:
+    """Test every queued call is submitted and runs."""
+    touch = CWLApp(os.path.join(test_cwl_files, "touch.cwl"))
+
+    with AsyncSubmitter(workers=2) as submitter:
+        calls = [
+            submitter.submit(touch, filenames=[str(tmp_path / f"file_{i}.txt")]) for i in range(50)
+        ]
+
+    assert [call.result() for call in calls] == [0] * 50
+    assert len(os.listdir(tmp_path)) == 50
+
+
+def test_submit_error() -> None:
+    """Test an error raised while processing the call is set on its placeholder."""
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc.cwl"))
+
+    with AsyncSubmitter() as submitter:
+        call = submitter.submit(word_count, stdout="wc.txt")
+
+    with pytest.raises(ArgumentMissing):
+        call.result()
+
+    with pytest.raises(ArgumentMissing):
+        call.outputs  # pylint: disable=pointless-statement
+
+    with pytest.raises(RuntimeError):
+        submitter.submit(word_count, stdout="wc.txt")
+
+
+def test_submit_app_input() -> None:
+    """Test a tool with an input called `app` can be submitted."""
+
+    def app_tool(app: str) -> Future:
+        future: Future = Future()
+        future.set_result(app)
+        return future
+
+    with AsyncSubmitter() as submitter:
+        call = submitter.submit(app_tool, app="x")
+
+    assert call.result() == "x"
+
+
+def test_backpressure() -> None:
+    """Test submit blocks while max_pending calls are queued."""
+    release = threading.Event()
+
+    def blocked_app() -> Future:
+        release.wait()
+        future: Future = Future()
+        future.set_result(0)
+        return future
+
+    submitter = AsyncSubmitter(workers=1, max_pending=1)
+    first = submitter.submit(blocked_app)
+    while not first.running():
+        pass
+
+    submitter.submit(blocked_app)
+    third = threading.Thread(target=submitter.submit, args=(blocked_app,))
+    third.start()
+    third.join(timeout=0.2)
+    assert third.is_alive()
+
+    release.set()
+    third.join()
+    submitter.shutdown()
+    assert first.result() == 0
+
+
+def test_chained_calls(tmp_path) -> None:
+    """Test outputs of a pending call are dependencies of later calls."""
+    cat = CWLApp(os.path.join(os.getcwd(), "tools", "cwl_files", "cat.cwl"))
+    word_count = CWLApp(os.path.join(test_cwl_files, "wc.cwl"))
+    cat_output = str(tmp_path / "cat.txt")
+    wc_output = str(tmp_path / "wc.txt")
+
+    with AsyncSubmitter() as submitter:
+        concatenated = submitter.submit(
+            cat, from_files=[File(os.path.join(test_cwl_files, "wc.cwl"))], to_file=cat_output
+        )
+        counted = word_count(text_file=concatenated.outputs[0], stdout=wc_output)
+
+    assert counted.result() == 0
+    with open(cat_output, "r", encoding="utf-8") as f:
+        lines = f.read().count("\n")
+
+    with open(wc_output, "r", encoding="utf-8") as f:
+        assert int(f.read().split()[0]) == lines
+
+
+def test_submit_during_shutdown() -> None:
+    """Test every call accepted while shutting down is still submitted."""
+
+    def app() -> Future:
+        future: Future = Future()
+        future.set_result(0)
+        return future
+
+    submitter = AsyncSubmitter(workers=2, max_pending=4)
+    accepted = []
+
+    def submit_until_shutdown() -> None:
+        while True:
+            try:
+                accepted.append(submitter.submit(app))
+
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=submit_until_shutdown) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    while len(accepted) < 100:
+        pass
+
+    submitter.shutdown()
+    for thread in threads:
+        thread.join()
+
+    assert all(call.result(timeout=5) == 0 for call in accepted)
+    submitter.shutdown()